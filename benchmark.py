@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Port-Phantom Scan Benchmark
+Times the scan pipeline end to end against a simulated network on loopback addresses
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import argparse
+import resource
+import tempfile
+import subprocess
+import ipaddress
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from src.config.settings import SCAN_PORTS, HTTP_PORTS
+
+console = Console()
+
+# Simulated device kinds: manufacturer, locally administered OUI, listening ports, Server header
+DEVICE_PROFILES = [
+    ("Hikvision", "02AA01", (80, 554, 8000), "Hikvision-Webs"),
+    ("TP-Link", "02AA02", (22, 53, 80, 443), "TP-LINK HTTPD/1.0"),
+    ("Dahua", "02AA03", (80, 554, 8080), "DahuaHttp"),
+    ("Synology", "02AA04", (22, 80, 443, 8081), "nginx"),
+    ("Raspberry Pi", "02AA05", (22,), None),
+]
+
+BENCHMARK_NETWORK = "127.1.0.0"
+DEFAULT_SIZES = "10,250,5000"
+
+# Import time budgets (ms, excluding interpreter site setup) for CLI paths
+# that never scan, and modules those paths must not load
+STARTUP_RUNS = 3  # best of, to filter out cold caches and scheduling noise
+STARTUP_BUDGETS = [
+    (["--help"], 100, ("yaml", "requests", "asyncio", "src.scanners.oui_index")),
+    (["--compare-only", "--no-banner", "-s", "192.0.2.0/24", "--history-backend", "json"], 130,
+     ("yaml", "requests", "asyncio", "src.scanners.oui_index")),
+]
+
+# Scans run by the daemon reuse check; every tick after the first must hit the cache
+DAEMON_CHECK_TICKS = 2
+
+
+class FakeDevice:
+    """One simulated host: address, MAC, listening ports and HTTP Server header"""
+
+    __slots__ = ('ip', 'mac', 'manufacturer', 'ports', 'server')
+
+    def __init__(self, ip, mac, manufacturer, ports, server):
+        self.ip = ip
+        self.mac = mac
+        self.manufacturer = manufacturer
+        self.ports = ports
+        self.server = server
+
+
+def build_network(count, listen_ports):
+    """Create count fake devices on consecutive loopback addresses"""
+    first = ipaddress.IPv4Address(BENCHMARK_NETWORK) + 1
+    devices = []
+
+    for i in range(count):
+        manufacturer, oui, ports, server = DEVICE_PROFILES[i % len(DEVICE_PROFILES)]
+        suffix = f"{i:06X}"
+        mac = ":".join(oui[j:j + 2] for j in range(0, 6, 2)) + ":" + ":".join(suffix[j:j + 2] for j in range(0, 6, 2))
+        ports = tuple(port for port in ports if port in listen_ports)
+        devices.append(FakeDevice(str(first + i), mac, manufacturer, ports, server))
+
+    return devices
+
+
+def get_oui_db():
+    """OUI map resolving the simulated devices' MAC prefixes"""
+    return {oui: manufacturer for manufacturer, oui, _, _ in DEVICE_PROFILES}
+
+
+def write_neighbor_table(devices, filename):
+    """Write the devices as a kernel neighbor table in /proc/net/arp format"""
+    with open(filename, 'w') as f:
+        f.write("IP address       HW type     Flags       HW address            Mask     Device\n")
+        for device in devices:
+            f.write(f"{device.ip:<16} 0x1         0x2         {device.mac.lower()}     *        lo\n")
+
+
+async def _serve(devices, ready):
+    """Listen on every device port, answering web ports with a canned response"""
+    def handler(server_header):
+        async def handle(reader, writer):
+            try:
+                if server_header:
+                    await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 5)
+                    writer.write(f"HTTP/1.0 200 OK\r\nServer: {server_header}\r\nContent-Length: 0\r\n\r\n".encode())
+                    await writer.drain()
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                pass
+            finally:
+                writer.close()
+        return handle
+
+    servers = []
+    for device in devices:
+        for port in device.ports:
+            web = HTTP_PORTS.get(port) == 'http'
+            servers.append(await asyncio.start_server(
+                handler(device.server if web else None), device.ip, port, reuse_address=True, backlog=64
+            ))
+
+    ready.send(len(servers))
+    await asyncio.Event().wait()
+
+
+def serve_network(devices, ready):
+    """Run the simulated network until terminated (child process entry point)"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    try:
+        asyncio.run(_serve(devices, ready))
+    except Exception as e:
+        ready.send(e)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run_scan(devices, neighbor_table, engine, workers, ports, timeout):
+    """Time process_network over the simulated network (runs in a fresh process)"""
+    # Keep scan progress output out of the benchmark report
+    sys.stdout = open(os.devnull, 'w')
+
+    from src.core import device_processor
+    from src.scanners import mac_scanner
+    from src.utils.metrics import metrics
+
+    mac_scanner.NEIGHBOR_TABLE_PATH = neighbor_table
+
+    discovered_at = {}
+    finished_at = {}
+
+    def fake_discovery(subnet):
+        for device in devices:
+            discovered_at[device.ip] = time.perf_counter()
+            yield device.ip
+
+    process_ip = device_processor.process_ip
+
+    def finish_ip(ip, *args, **kwargs):
+        device = process_ip(ip, *args, **kwargs)
+        finished_at[ip] = time.perf_counter()
+        return device
+
+    device_processor.iter_active_hosts = fake_discovery
+    device_processor.process_ip = finish_ip
+    metrics.reset()
+
+    start = time.perf_counter()
+    results = device_processor.process_network(f"{BENCHMARK_NETWORK}/12", get_oui_db(), ports, workers, engine,
+                                               timeout=timeout / 1000 if timeout else None)
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(finished_at[ip] - discovered_at[ip] for ip in finished_at if ip in discovered_at)
+    expected = {device.ip: device.ports for device in devices}
+
+    return {
+        'hosts': len(devices),
+        'engine': engine,
+        'workers': workers,
+        'seconds': elapsed,
+        'hosts_per_second': len(results) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'correct': sum(1 for device in results if tuple(device.ports) == tuple(sorted(expected.get(device['ip'], ())))),
+        'stages': metrics.to_dict()['stages'],
+        'counters': metrics.to_dict()['counters'],
+    }
+
+
+def run_daemon_ticks(devices, neighbor_table, engine, ports, directory):
+    """Run daemon mode with incremental reuse for DAEMON_CHECK_TICKS scans of the
+    simulated network, returning each tick's counters (runs in a fresh process)"""
+    sys.stdout = open(os.devnull, 'w')
+    # Keep history and reports written by the scans out of the working tree
+    os.chdir(directory)
+
+    import main
+    from src.core import device_processor
+    from src.scanners import mac_scanner
+    from src.utils.metrics import metrics
+
+    mac_scanner.NEIGHBOR_TABLE_PATH = neighbor_table
+    device_processor.iter_active_hosts = lambda subnet: (device.ip for device in devices)
+    main.load_databases = lambda args, progress: (None, get_oui_db())
+
+    ticks = []
+    run_scan_cycle = main.run_scan_cycle
+
+    def counted_cycle(*args, **kwargs):
+        scan_data = run_scan_cycle(*args, **kwargs)
+        ticks.append(metrics.to_dict()['counters'])
+        if len(ticks) == DAEMON_CHECK_TICKS:
+            os.kill(os.getpid(), signal.SIGTERM)
+        return scan_data
+
+    main.run_scan_cycle = counted_cycle
+    args = main.create_parser().parse_args([
+        '--daemon', '--incremental', '--interval', '1', '--no-save', '--no-telegram', '--no-comparison',
+        '--no-signatures', '--no-banner', '--quiet', '--engine', engine,
+        '--ports', ','.join(map(str, ports)), '-s', f"{BENCHMARK_NETWORK}/12",
+    ])
+    args.jitter = 0
+    main.daemon_mode(args)
+    return ticks
+
+
+@contextmanager
+def simulated_network(devices):
+    """Serve the devices in a child process, yielding (listening sockets, neighbor table, fork context)"""
+    context = multiprocessing.get_context('fork')
+    receiver, sender = context.Pipe(duplex=False)
+    server = context.Process(target=serve_network, args=(devices, sender), daemon=True)
+    server.start()
+
+    try:
+        listening = receiver.recv()
+        if isinstance(listening, Exception):
+            raise listening
+
+        with tempfile.TemporaryDirectory() as directory:
+            neighbor_table = os.path.join(directory, "arp")
+            write_neighbor_table(devices, neighbor_table)
+            yield listening, neighbor_table, context
+    finally:
+        server.terminate()
+        server.join()
+
+
+def benchmark(count, engine, workers, ports, listen_ports, timeout):
+    """Stand up a network of count devices and scan it once"""
+    devices = build_network(count, listen_ports)
+
+    with simulated_network(devices) as (listening, neighbor_table, context):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(run_scan, devices, neighbor_table, engine, workers, ports, timeout).result()
+
+    result['listening'] = listening
+    return result
+
+
+def check_daemon_reuse(count, engine, ports, listen_ports):
+    """Check that daemon mode ticks after the first reuse every unchanged host"""
+    devices = build_network(count, listen_ports)
+
+    with simulated_network(devices) as (_, neighbor_table, context):
+        with tempfile.TemporaryDirectory() as directory:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                ticks = executor.submit(run_daemon_ticks, devices, neighbor_table, engine, ports, directory).result()
+
+    table = Table(box=box.ROUNDED, title="♻ Daemon Incremental Reuse", title_style="bold #1E90FF")
+    table.add_column("Tick", style="bold #6495ED", justify="right")
+    table.add_column("Reused Hosts", style="#48D1CC", justify="right")
+    table.add_column("Expected", style="#48D1CC", justify="right")
+
+    passed = len(ticks) == DAEMON_CHECK_TICKS
+    for tick, counters in enumerate(ticks, 1):
+        expected = 0 if tick == 1 else count
+        reused = counters.get('cached_hosts', 0)
+        passed = passed and reused == expected
+        table.add_row(str(tick), f"[{'green' if reused == expected else 'red'}]{reused}[/]", str(expected))
+
+    console.print(table)
+    return passed
+
+
+def measure_startup(argv):
+    """Run main.py under -X importtime, returning (import ms, per-module self ms)"""
+    main_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    with tempfile.TemporaryDirectory() as directory:
+        result = subprocess.run([sys.executable, "-X", "importtime", main_script, *argv],
+                                capture_output=True, text=True, cwd=directory)
+
+    modules = {}
+    site = 0
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if not line.startswith("import time:") or len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        module = parts[2].strip()
+        modules[module] = int(parts[0].split(':')[1]) / 1000
+        if module == "site":
+            site = int(parts[1]) / 1000
+
+    return sum(modules.values()) - site, modules
+
+
+def check_startup():
+    """Check CLI startup import time and lazily loaded modules against their budgets"""
+    table = Table(box=box.ROUNDED, title="🚀 Startup Import Budget", title_style="bold #1E90FF")
+    table.add_column("Command", style="bold #6495ED")
+    table.add_column("Imports", style="#48D1CC", justify="right")
+    table.add_column("Budget", style="#48D1CC", justify="right")
+    table.add_column("Unexpected Modules", style="#FF6B6B")
+    table.add_column("Heaviest Imports", style="#48D1CC")
+
+    passed = True
+    for argv, budget, forbidden in STARTUP_BUDGETS:
+        total, modules = min((measure_startup(argv) for _ in range(STARTUP_RUNS)), key=lambda run: run[0])
+        loaded = [module for module in forbidden if module in modules]
+        heaviest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:3]
+        ok = total <= budget and not loaded
+        passed = passed and ok
+
+        table.add_row(
+            " ".join(argv),
+            f"[{'green' if total <= budget else 'red'}]{total:.1f} ms[/]",
+            f"{budget} ms",
+            ", ".join(loaded) or "-",
+            ", ".join(f"{module} {ms:.1f}" for module, ms in heaviest)
+        )
+
+    console.print(table)
+    return passed
+
+
+def print_results(results):
+    """Display benchmark results in a table"""
+    table = Table(box=box.ROUNDED, title="⏱ Scan Benchmark", title_style="bold #1E90FF")
+    for column in ("Hosts", "Engine", "Time", "Hosts/s", "p50", "p99", "Peak RSS", "Correct", "Ports", "HTTP", "Classify"):
+        table.add_column(column, style="#48D1CC", justify="right")
+
+    for result in results:
+        stages = result['stages']
+        stage = lambda name: f"{stages.get(name, {}).get('seconds', 0.0):.2f}s"
+        table.add_row(
+            str(result['hosts']),
+            result['engine'],
+            f"{result['seconds']:.2f}s",
+            f"{result['hosts_per_second']:.1f}",
+            f"{result['p50_ms']:.0f} ms",
+            f"{result['p99_ms']:.0f} ms",
+            f"{result['peak_rss_mb']:.0f} MB",
+            f"{result['correct']}/{result['hosts']}",
+            stage('ports'),
+            stage('http'),
+            stage('classify'),
+        )
+
+    console.print(table)
+    console.print("[dim]Stage times are summed over concurrent batches[/dim]")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark Port-Phantom against a simulated loopback network")
+    parser.add_argument('--hosts', default=DEFAULT_SIZES, metavar='N,...',
+                        help=f'Comma-separated network sizes to benchmark (default: {DEFAULT_SIZES})')
+    parser.add_argument('--engine', choices=['nmap', 'asyncio'], default='asyncio',
+                        help='Port scan engine to benchmark (default: asyncio)')
+    parser.add_argument('--workers', type=int, metavar='N', help='Batches processed in parallel (default: MAX_WORKERS setting)')
+    parser.add_argument('--ports', metavar='PORTS', help='Ports to probe (default: SCAN_PORTS setting)')
+    parser.add_argument('--timeout', type=int, metavar='MS',
+                        help='Port scan connect timeout in milliseconds (default: CONNECTION_TIMEOUT setting)')
+    parser.add_argument('--listen-ports', metavar='PORTS',
+                        help='Ports the fake devices may listen on (default: SCAN_PORTS, unprivileged only unless root)')
+    parser.add_argument('--output', metavar='FILE', help='Also write results to a JSON file')
+    parser.add_argument('--startup', action='store_true',
+                        help='Check CLI startup import time against its budget instead of scanning')
+    parser.add_argument('--daemon-check', action='store_true',
+                        help='Check that daemon mode reuses results of the first --hosts size on its second tick')
+    args = parser.parse_args()
+
+    if args.startup:
+        sys.exit(0 if check_startup() else 1)
+
+    ports = [int(p) for p in args.ports.split(',')] if args.ports else SCAN_PORTS
+    if args.listen_ports:
+        listen_ports = {int(p) for p in args.listen_ports.split(',')}
+    else:
+        listen_ports = {port for port in SCAN_PORTS if os.geteuid() == 0 or port >= 1024}
+
+    if args.daemon_check:
+        count = int(args.hosts.split(',')[0])
+        sys.exit(0 if check_daemon_reuse(count, args.engine, ports, listen_ports) else 1)
+
+    results = []
+    for count in (int(n) for n in args.hosts.split(',')):
+        console.print(f":stopwatch: [bold blue]Benchmarking {count} hosts...[/bold blue]")
+        try:
+            results.append(benchmark(count, args.engine, args.workers, ports, listen_ports, args.timeout))
+        except Exception as e:
+            console.print(f":x: [bold red]Benchmark of {count} hosts failed:[/bold red] {e}")
+
+    if results:
+        print_results(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=4)
+        console.print(f":floppy_disk: [bold green]Results saved to[/bold green] [underline]{args.output}[/underline]")
+
+    if not results:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
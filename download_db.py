@@ -14,10 +14,15 @@ from rich import box
 
 console = Console()
 
-def download_oui_database():
+# IEEE registries: MA-L (24-bit), MA-M (28-bit) and MA-S (36-bit) assignments
+REGISTRIES = [
+    ("https://standards-oui.ieee.org/oui.txt", "data/oui.txt", 1024 * 1024),
+    ("https://standards-oui.ieee.org/oui28/mam.txt", "data/mam.txt", 100 * 1024),
+    ("https://standards-oui.ieee.org/oui36/oui36.txt", "data/oui36.txt", 100 * 1024),
+]
+
+def download_oui_database(url="https://standards-oui.ieee.org/oui.txt", filename="data/oui.txt", min_size=1024 * 1024):
     """Download OUI database from IEEE"""
-    url = "https://standards-oui.ieee.org/oui.txt"
-    filename = "data/oui.txt"
     
     # Create data directory if it doesn't exist
     os.makedirs("data", exist_ok=True)
@@ -29,7 +34,7 @@ def download_oui_database():
         
         # Check file size
         file_size = os.path.getsize(filename)
-        if file_size > 1024 * 1024:  # More than 1MB
+        if file_size > min_size:
             console.print(":white_check_mark: [green]Database appears to be valid (size: {:.1f} MB)[/green]".format(file_size / (1024 * 1024)), style="green")
             return True
         else:
@@ -71,7 +76,7 @@ def download_oui_database():
         
         # Validate downloaded file
         file_size = os.path.getsize(filename)
-        if file_size < 1024 * 1024:  # Less than 1MB
+        if file_size < min_size:
             console.print(":x: [bold red]Downloaded file is too small, download may have failed[/bold red]", style="red")
             return False
         
@@ -114,7 +119,7 @@ def main():
     ))
     console.print()
     
-    success = download_oui_database()
+    success = all([download_oui_database(url, filename, min_size) for url, filename, min_size in REGISTRIES])
     
     if success:
         console.print()
@@ -7,26 +7,21 @@ Main entry point with CLI interface
 import sys
 import os
 import time
+import signal
 import argparse
+from contextlib import ExitStack, nullcontext
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
-from rich.panel import Panel
-from rich.table import Table
-from rich import box
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+# Only what argument parsing needs is imported up front; each stage imports
+# its own subsystem so that e.g. --help or --compare-only never load PyYAML,
+# requests or the OUI database
 from src.utils.banner import print_banner
-from src.config.settings import MAIN_COLOR, DEFAULT_SUBNET
-from src.config.signature_loader import load_signatures
-from src.scanners.mac_scanner import load_oui_db
-from src.scanners.network_scanner import find_subnet
-from src.core.device_processor import process_network
-from src.classifiers.signature_matcher import check_against_signatures, print_matches
-from src.reports.report_generator import save_current_scan, load_prev_scan, save_exportable_report, save_csv_report, save_json_report
-from src.reports.scan_comparator import compare_scans
-from src.utils.telegram_sender import send_scan_results
+from src.config.settings import MAIN_COLOR, DAEMON_INTERVAL, DAEMON_JITTER, METRICS_TEXTFILE
+from src.core.scan_cache import parse_max_age
+from src.utils.metrics import metrics
 
 console = Console()
 
@@ -45,6 +40,7 @@ Examples:
   %(prog)s --compare-only     # Only compare with previous scan
   %(prog)s --verbose          # Enable verbose output
   %(prog)s --ports 22,80,443  # Scan specific ports only
+  %(prog)s --daemon -s 10.0.0.0/24,10.0.1.0/24@30m  # Rescan subnets on a schedule
         """
     )
     
@@ -54,26 +50,53 @@ Examples:
         '-s', '--subnet',
         metavar='SUBNET',
         default=None,
-        help='Target subnet to scan (default: auto-detect)'
+        help='Target subnet(s) to scan, comma-separated (default: auto-detect)'
+    )
+    network_group.add_argument(
+        '--all-subnets',
+        action='store_true',
+        help='Scan every attached IPv4 network when auto-detecting'
     )
     network_group.add_argument(
         '--ports',
         metavar='PORTS',
         help='Comma-separated list of ports to scan (default: 21,22,23,53,80,443,554,2222,3389,8080,8000)'
     )
+    network_group.add_argument(
+        '--engine',
+        choices=['nmap', 'asyncio'],
+        default='nmap',
+        help='Port scan engine: external nmap or built-in asyncio connect scan (default: nmap)'
+    )
+    network_group.add_argument(
+        '--sharded',
+        action='store_true',
+        help='Scan large targets shard by shard, streaming results to a JSONL file'
+    )
+    network_group.add_argument(
+        '--shard-size',
+        type=int,
+        metavar='N',
+        help='Addresses per shard in sharded mode (default: SCAN_BATCH_SIZE setting)'
+    )
     network_group.add_argument(
         '--timeout',
         type=int,
-        default=50,
-        help='Host timeout in milliseconds (default: 50)'
+        metavar='MS',
+        help='Connect timeout of the asyncio engine in milliseconds (default: CONNECTION_TIMEOUT setting)'
     )
     
     # Output options
     output_group = parser.add_argument_group('Output Options')
     output_group.add_argument(
         '--export',
-        choices=['json', 'csv', 'both'],
-        help='Export results in specified format(s)'
+        choices=['json', 'jsonl', 'csv', 'both'],
+        help='Export results to one file per format per scan (json is written as JSONL)'
+    )
+    output_group.add_argument(
+        '--compress',
+        action='store_true',
+        help='Gzip exported files'
     )
     output_group.add_argument(
         '--output-dir',
@@ -81,6 +104,18 @@ Examples:
         default='history',
         help='Directory to save reports (default: history)'
     )
+    output_group.add_argument(
+        '--history-backend',
+        choices=['sqlite', 'json'],
+        default='sqlite',
+        help='Scan history storage backend (default: sqlite)'
+    )
+    output_group.add_argument(
+        '--metrics-file',
+        metavar='FILE',
+        default=METRICS_TEXTFILE,
+        help='Write per-stage scan metrics to a Prometheus textfile (node_exporter textfile collector)'
+    )
     output_group.add_argument(
         '--no-save',
         action='store_true',
@@ -104,12 +139,46 @@ Examples:
         action='store_true',
         help='Skip comparison with previous scans'
     )
+    features_group.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Reuse recent results for hosts whose MAC address is unchanged'
+    )
+    features_group.add_argument(
+        '--max-age',
+        type=parse_max_age,
+        default='1h',
+        metavar='AGE',
+        help='Maximum age of reused results in incremental mode, e.g. 30m, 1h (default: 1h)'
+    )
     features_group.add_argument(
         '--compare-only',
         action='store_true',
         help='Only compare with previous scan, do not scan network'
     )
     
+    # Daemon options
+    daemon_group = parser.add_argument_group('Daemon Options')
+    daemon_group.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Keep running and rescan each subnet on a schedule (SUBNET@INTERVAL sets a per-subnet interval)'
+    )
+    daemon_group.add_argument(
+        '--interval',
+        type=parse_max_age,
+        default=DAEMON_INTERVAL,
+        metavar='INTERVAL',
+        help='Default time between scans of a subnet in daemon mode, e.g. 10m (default: 10m)'
+    )
+    daemon_group.add_argument(
+        '--jitter',
+        type=parse_max_age,
+        default=DAEMON_JITTER,
+        metavar='JITTER',
+        help='Maximum random delay added to each interval, e.g. 30s (default: 30s)'
+    )
+    
     # Display options
     display_group = parser.add_argument_group('Display Options')
     display_group.add_argument(
@@ -140,6 +209,23 @@ Examples:
         metavar='FILE',
         help='Custom signatures file path'
     )
+    advanced_group.add_argument(
+        '--workers',
+        type=int,
+        metavar='N',
+        help='Number of hosts processed in parallel (default: MAX_WORKERS setting)'
+    )
+    advanced_group.add_argument(
+        '--processes',
+        type=int,
+        metavar='N',
+        help='Scan shards in N worker processes (one shard per /24 by default)'
+    )
+    advanced_group.add_argument(
+        '--profile',
+        action='store_true',
+        help='Profile CPU and memory of each scan, writing reports next to the scan history'
+    )
     advanced_group.add_argument(
         '--telegram-user',
         type=int,
@@ -150,36 +236,55 @@ Examples:
 
 
 def update_settings_from_args(args):
-    """Update settings based on command line arguments"""
-    from src.config.settings import SCAN_PORTS, SCAN_TIMEOUT
+    """Update settings based on command line arguments
+
+    Returns the ports to scan and the port scan connect timeout in seconds,
+    None to use the engine default.
+    """
+    from src.config.settings import SCAN_PORTS
     
     ports = SCAN_PORTS.copy()
-    timeout = SCAN_TIMEOUT
+    timeout = None
     
     if args.ports:
         ports = [int(p.strip()) for p in args.ports.split(',')]
     
     if args.timeout:
-        timeout = args.timeout
+        timeout = args.timeout / 1000
     
     return ports, timeout
 
 
-def display_scan_statistics(devices, subnet, scan_time):
+def create_progress():
+    """Create the progress display used while loading and scanning"""
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+    
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TaskProgressColumn(),
+        console=console
+    )
+
+
+def display_scan_statistics(devices, subnet, scan_time, stats=None):
     """Display scan statistics in a beautiful table"""
-    if not devices:
+    from rich.table import Table
+    from rich import box
+    from src.reports.statistics import ScanStatistics
+    
+    # Calculate statistics unless running aggregates were collected
+    if stats is None:
+        stats = ScanStatistics().add_all(devices or [])
+    if not stats.total:
         return
     
-    # Calculate statistics
-    total_devices = len(devices)
-    high_risk = sum(1 for d in devices if d.get('level') == 'High')
-    medium_risk = sum(1 for d in devices if d.get('level') == 'Medium')
-    low_risk = sum(1 for d in devices if d.get('level') == 'Low')
-    
-    manufacturers = {}
-    for device in devices:
-        mfr = device.get('manufacturer', 'Unknown')
-        manufacturers[mfr] = manufacturers.get(mfr, 0) + 1
+    total_devices = stats.total
+    high_risk = stats.count('High')
+    medium_risk = stats.count('Medium')
+    low_risk = stats.count('Low')
+    manufacturers = stats.manufacturers
     
     # Create statistics table
     stats_table = Table(box=box.ROUNDED, title="📊 Scan Statistics", title_style="bold #1E90FF")
@@ -209,46 +314,107 @@ def display_scan_statistics(devices, subnet, scan_time):
         
         console.print(mfr_table)
         console.print()
+    
+    display_stage_timings(metrics.to_dict())
 
 
-def scan_network_with_options(args):
-    """Perform network scan with specified options"""
-    start_time = time.time()
+def display_stage_timings(snapshot):
+    """Display time spent per pipeline stage"""
+    from rich.table import Table
+    from rich import box
+    
+    if not snapshot['stages']:
+        return
+    
+    timing_table = Table(box=box.ROUNDED, title="⏱ Stage Timings", title_style="bold #1E90FF")
+    timing_table.add_column("Stage", style="bold #6495ED")
+    timing_table.add_column("Calls", style="#48D1CC", justify="right")
+    timing_table.add_column("Hosts", style="#48D1CC", justify="right")
+    timing_table.add_column("Total", style="#48D1CC", justify="right")
+    timing_table.add_column("Per Host", style="#48D1CC", justify="right")
+    timing_table.add_column("Slowest Call", style="#48D1CC", justify="right")
+    
+    for stage, timing in snapshot['stages'].items():
+        per_host = f"{timing['seconds'] / timing['hosts'] * 1000:.1f} ms" if timing['hosts'] else "-"
+        timing_table.add_row(
+            stage,
+            str(timing['calls']),
+            str(timing['hosts']),
+            f"{timing['seconds']:.2f} s",
+            per_host,
+            f"{timing['max_seconds']:.2f} s"
+        )
+    
+    for name, value in snapshot['counters'].items():
+        timing_table.add_row(name.replace('_', ' ').capitalize(), str(value), "", "", "", "")
+    
+    console.print(timing_table)
+    console.print("[dim]Stage totals are summed over concurrent workers[/dim]")
+    console.print()
+
+
+def load_databases(args, progress):
+    """Load signatures and the OUI database, reporting on a progress display"""
+    from src.scanners.mac_scanner import load_oui_db
+    
+    # Load signatures
+    signatures = None
+    if not args.no_signatures:
+        from src.classifiers.signature_cache import load_signature_index
+        
+        task = progress.add_task("Loading signatures...", total=1)
+        with metrics.span('load_databases', 0):
+            signatures = load_signature_index(args.signatures_file)
+        progress.update(task, completed=1)
+    
+    # Load OUI database
+    task = progress.add_task("Loading OUI database...", total=1)
+    with metrics.span('load_databases', 0):
+        oui_db = load_oui_db(args.oui_file)
+    progress.update(task, completed=1)
+    
+    return signatures, oui_db
+
+
+def scan_network_with_options(args, subnet, previous_data=None, databases=None):
+    """Perform network scan with specified options
+
+    Already loaded databases can be passed in to skip reloading them.
+    """
+    from src.core.device_processor import process_network
+    from src.core.shard_scanner import scan_sharded
+    from src.core.scan_cache import build_scan_cache
+    from src.classifiers.signature_matcher import match_devices, print_matches
     
     # Update settings
     ports, timeout = update_settings_from_args(args)
     
-    # Determine subnet
-    subnet = args.subnet or find_subnet()
-    
     if args.verbose:
         console.print(f":mag: [bold green]Using subnet:[/bold green] {subnet}", style=MAIN_COLOR)
         console.print(f":gear: [bold green]Scanning ports:[/bold green] {ports}", style=MAIN_COLOR)
     
     # Load databases with progress
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TaskProgressColumn(),
-        console=console
-    ) as progress:
+    with create_progress() as progress:
         
-        # Load signatures
-        signatures = None
-        if not args.no_signatures:
-            task = progress.add_task("Loading signatures...", total=1)
-            signatures = load_signatures(args.signatures_file)
-            progress.update(task, completed=1)
+        signatures, oui_db = databases or load_databases(args, progress)
         
-        # Load OUI database
-        task = progress.add_task("Loading OUI database...", total=1)
-        oui_db = load_oui_db(args.oui_file)
-        progress.update(task, completed=1)
+        # Scan duration excludes database loading
+        start_time = time.time()
         
-        # Process network
+        # Reuse recent results from the previous scan
+        cache = None
+        if args.incremental:
+            cache = build_scan_cache(previous_data, args.max_age, ports)
+        
+        # Process network, split across worker processes if requested
         task = progress.add_task("Scanning network...", total=1)
-        devices = process_network(subnet, oui_db, ports)
+        if args.processes and args.processes > 1:
+            devices = []
+            scan_sharded(subnet, oui_db, devices.extend, ports, args.workers, args.engine, cache,
+                         shard_size=args.shard_size, processes=args.processes, oui_file=args.oui_file,
+                         timeout=timeout)
+        else:
+            devices = process_network(subnet, oui_db, ports, args.workers, args.engine, cache, timeout)
         progress.update(task, completed=1)
     
     scan_time = time.time() - start_time
@@ -260,60 +426,243 @@ def scan_network_with_options(args):
     # Check signatures
     if signatures and not args.no_signatures:
         console.print(":warning: [bold yellow]Checking device signatures...[/bold yellow]", style=MAIN_COLOR)
-        for device in devices:
-            matches = check_against_signatures(device, signatures)
+        with metrics.span('signatures', len(devices)):
+            all_matches = match_devices(devices, signatures)
+        for device, matches in zip(devices, all_matches):
             print_matches(device, matches)
     
     return devices, subnet, scan_time
 
 
+def sharded_scan_with_options(args):
+    """Scan shard by shard, streaming devices to a JSONL file with flat memory
+
+    With --no-save nothing is written; devices are only counted and matched.
+    """
+    from src.scanners.network_scanner import find_subnet
+    from src.core.shard_scanner import scan_sharded
+    from src.classifiers.signature_matcher import match_devices, print_matches
+    from src.reports.report_generator import ScanResultStream
+    from src.reports.export_writer import ScanExporter, get_export_formats
+    from src.reports.statistics import ScanStatistics
+    
+    metrics.reset()
+    ports, timeout = update_settings_from_args(args)
+    subnet = args.subnet or find_subnet(args.all_subnets)
+    
+    with create_progress() as progress:
+        signatures, oui_db = load_databases(args, progress)
+    
+    start_time = time.time()
+    stats = ScanStatistics()
+    
+    with ExitStack() as outputs:
+        stream = None
+        exporters = []
+        if not args.no_save:
+            stream = outputs.enter_context(ScanResultStream(subnet, args.output_dir))
+            exporters = [
+                outputs.enter_context(ScanExporter(export_format, subnet, args.output_dir, args.compress))
+                for export_format in get_export_formats(args.export)
+            ]
+        
+        def handle_shard(devices):
+            if stream:
+                stream.write(devices)
+            for exporter in exporters:
+                exporter.write(devices)
+            stats.add_all(devices)
+            if signatures:
+                with metrics.span('signatures', len(devices)):
+                    all_matches = match_devices(devices, signatures)
+                for device, matches in zip(devices, all_matches):
+                    print_matches(device, matches)
+        
+        scan_sharded(subnet, oui_db, handle_shard, ports, args.workers, args.engine,
+                     shard_size=args.shard_size, processes=args.processes, oui_file=args.oui_file,
+                     timeout=timeout)
+    
+    scan_time = time.time() - start_time
+    if stream:
+        console.print(f":floppy_disk: [bold green]{stream.count} devices streamed to[/bold green] [underline]{stream.filename}[/underline]", style=MAIN_COLOR)
+    
+    if not args.quiet:
+        display_scan_statistics(None, subnet, scan_time, stats)
+    
+    save_metrics_with_options(subnet, scan_time, stats.total, args)
+    
+    return stats, subnet, scan_time
+
+
 def save_results_with_options(devices, subnet, args):
-    """Save results based on command line options"""
+    """Save results based on command line options
+
+    Returns the scan record, kept as the previous scan of the next cycle, and
+    the exportable report file.
+    """
+    from src.reports.report_generator import build_scan_record, save_current_scan, save_exportable_report
+    from src.reports.export_writer import get_export_formats, export_devices
+    
+    # The record keeps the probed ports, without which incremental reuse is skipped
+    ports, _ = update_settings_from_args(args)
     if args.no_save:
-        return
+        return build_scan_record(devices, subnet, ports), None
     
-    # Save current scan
-    current_data = save_current_scan(devices, subnet)
+    with metrics.span('save', len(devices)):
+        scan_data = save_current_scan(devices, subnet, ports, args.history_backend, metrics.to_dict())
     
-    # Export in specified format
-    if args.export:
-        for device in devices:
-            if args.export in ['csv', 'both']:
-                save_csv_report(device)
-            if args.export in ['json', 'both']:
-                save_json_report(device)
+    # Export in specified formats, one file each
+    timestamp = int(time.time())
+    for export_format in get_export_formats(args.export):
+        with metrics.span('export', len(devices)):
+            export_devices(devices, subnet, export_format, args.output_dir, args.compress, timestamp)
     
     # Save exportable report for Telegram
+    report_file = None
     if not args.no_telegram:
-        timestamp = int(time.time())
-        save_exportable_report(devices, timestamp, args.telegram_user or "user")
+        with metrics.span('export', len(devices)):
+            report_file = save_exportable_report(devices, timestamp, args.telegram_user or "user")
+    return scan_data, report_file
 
 
-def compare_with_previous(devices, subnet, args):
+def save_metrics_with_options(subnet, scan_time, device_count, args):
+    """Write the scan's metrics to the Prometheus textfile if configured"""
+    if not args.metrics_file:
+        return
+    
+    from src.utils.metrics import write_prometheus_textfile
+    
+    try:
+        write_prometheus_textfile(args.metrics_file, subnet, metrics.to_dict(), scan_time, device_count)
+    except OSError as e:
+        console.print(f":x: [bold red]Failed to write metrics:[/bold red] {e}", style=MAIN_COLOR)
+
+
+def compare_with_previous(devices, previous_data, args):
     """Compare with previous scan if enabled"""
     if args.no_comparison:
         return
     
-    previous_data = load_prev_scan(subnet)
-    compare_scans(devices, previous_data)
+    from src.reports.scan_comparator import compare_scans
+    
+    with metrics.span('compare', len(devices)):
+        return compare_scans(devices, previous_data)
+
+
+def send_notifications(devices, args, report_file=None, changes=None):
+    """Queue notifications if enabled, delivered in the background
+
+    Changes since the previous scan go out first as a separate alert.
+    """
+    if args.no_telegram:
+        return
+    
+    from src.reports.scan_comparator import has_changes
+    from src.utils.telegram_sender import queue_scan_results, queue_scan_changes
+    
+    if changes and has_changes(changes):
+        queue_scan_changes(changes, args.telegram_user)
+    queue_scan_results(devices, args.telegram_user, report_file)
 
 
-def send_notifications(devices, args):
-    """Send notifications if enabled"""
+def flush_notifications(args):
+    """Give queued notifications a bounded time to go out"""
     if args.no_telegram:
         return
     
-    send_scan_results(devices, args.telegram_user)
+    from src.utils.telegram_sender import flush_deliveries
+    
+    flush_deliveries()
+
+
+def profile_with_options(subnet, args):
+    """Get a CPU and memory profiler for a scan when --profile is given"""
+    if not args.profile:
+        return nullcontext()
+    
+    from src.utils.profiler import ScanProfiler
+    
+    return ScanProfiler(subnet)
+
+
+def load_previous_with_options(subnet, args):
+    """Load the previous scan when incremental reuse or comparison needs it"""
+    if args.incremental or not args.no_comparison:
+        from src.reports.report_generator import load_prev_scan
+        
+        return load_prev_scan(subnet, args.history_backend)
+    return None
+
+
+def run_scan_cycle(args, subnet, previous_data, databases=None):
+    """Scan, then display, save, compare and notify; returns the scan record"""
+    metrics.reset()
+    with profile_with_options(subnet, args):
+        devices, subnet, scan_time = scan_network_with_options(args, subnet, previous_data, databases)
+        if not devices:
+            return None
+        
+        # Display statistics
+        if not args.quiet:
+            display_scan_statistics(devices, subnet, scan_time)
+        
+        # Save results
+        scan_data, report_file = save_results_with_options(devices, subnet, args)
+        
+        # Compare with previous
+        changes = compare_with_previous(devices, previous_data, args)
+        
+        # Send notifications
+        send_notifications(devices, args, report_file, changes)
+    
+    save_metrics_with_options(subnet, scan_time, len(devices), args)
+    
+    return scan_data
+
+
+def daemon_mode(args):
+    """Rescan subnets on a schedule, keeping databases and the last results in memory"""
+    from src.scanners.network_scanner import find_subnet
+    from src.core.scheduler import ScanScheduler, parse_schedule
+    
+    with create_progress() as progress:
+        databases = load_databases(args, progress)
+    
+    scheduler = ScanScheduler(args.jitter)
+    for subnet, interval in parse_schedule(args.subnet or find_subnet(args.all_subnets), args.interval):
+        scheduler.add(subnet, interval)
+        console.print(f":alarm_clock: [bold green]Scheduled {subnet} every[/bold green] {interval:g}s", style=MAIN_COLOR)
+    
+    # History is read from disk once per subnet, later cycles compare in memory
+    previous_scans = {}
+    
+    def scan_subnet(subnet):
+        if subnet not in previous_scans:
+            previous_scans[subnet] = load_previous_with_options(subnet, args)
+        
+        scan_data = run_scan_cycle(args, subnet, previous_scans[subnet], databases)
+        if scan_data:
+            previous_scans[subnet] = scan_data
+    
+    signal.signal(signal.SIGTERM, lambda signum, frame: scheduler.stop())
+    scheduler.run(scan_subnet)
+    flush_notifications(args)
+    console.print(":stop_sign: [bold yellow]Daemon stopped[/bold yellow]", style=MAIN_COLOR)
 
 
 def compare_only_mode(args):
     """Handle compare-only mode"""
-    subnet = args.subnet or find_subnet()
+    from rich.table import Table
+    from rich import box
+    from src.scanners.network_scanner import find_subnet
+    from src.reports.report_generator import load_prev_scan
+    
+    subnet = args.subnet or find_subnet(args.all_subnets)
     
     if args.verbose:
         console.print(f":mag: [bold green]Loading previous scan for subnet:[/bold green] {subnet}", style=MAIN_COLOR)
     
-    previous_data = load_prev_scan(subnet)
+    previous_data = load_prev_scan(subnet, args.history_backend)
     if not previous_data:
         console.print(":x: [bold red]No previous scan found for comparison[/bold red]", style=MAIN_COLOR)
         return
@@ -364,23 +713,29 @@ def main():
             compare_only_mode(args)
             return
         
-        # Perform scan
-        devices, subnet, scan_time = scan_network_with_options(args)
-        if not devices:
+        # Daemon mode runs scan cycles until stopped
+        if args.daemon:
+            daemon_mode(args)
             return
         
-        # Display statistics
-        if not args.quiet:
-            display_scan_statistics(devices, subnet, scan_time)
+        # Sharded mode streams results and keeps no device list to compare or send
+        if args.sharded:
+            with profile_with_options(args.subnet or "sharded", args):
+                sharded_scan_with_options(args)
+            return
         
-        # Save results
-        save_results_with_options(devices, subnet, args)
+        # Load the previous scan before this one is saved over it
+        from src.scanners.network_scanner import find_subnet
         
-        # Compare with previous
-        compare_with_previous(devices, subnet, args)
+        subnet = args.subnet or find_subnet(args.all_subnets)
+        previous_data = load_previous_with_options(subnet, args)
         
-        # Send notifications
-        send_notifications(devices, args)
+        # Scan, save, compare and notify
+        if not run_scan_cycle(args, subnet, previous_data):
+            return
+        
+        # Give queued notifications a bounded time to go out
+        flush_notifications(args)
         
         if not args.quiet:
             console.print(":white_check_mark: [bold green]Scan completed successfully![/bold green]", style=MAIN_COLOR)
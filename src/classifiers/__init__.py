@@ -2,14 +2,30 @@
 Device classification modules
 """
 
-from .device_classifier import classify_by_manufacturer, classify_by_ports, classify_by_http, classify_device
-from .signature_matcher import check_against_signatures, print_matches
-
-__all__ = [
-    'classify_by_manufacturer',
-    'classify_by_ports',
-    'classify_by_http',
-    'classify_device',
-    'check_against_signatures',
-    'print_matches'
-] 
\ No newline at end of file
+import importlib
+
+# Public name -> defining submodule, imported on first access
+_EXPORTS = {
+    'classify_by_manufacturer': 'device_classifier',
+    'classify_by_ports': 'device_classifier',
+    'classify_by_http': 'device_classifier',
+    'classify_device': 'device_classifier',
+    'SignatureIndex': 'signature_matcher',
+    'compile_signatures': 'signature_matcher',
+    'check_against_signatures': 'signature_matcher',
+    'match_devices': 'signature_matcher',
+    'print_matches': 'signature_matcher',
+    'normalize_signature': 'signature_cache',
+    'compile_signature_data': 'signature_cache',
+    'load_signature_index': 'signature_cache',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
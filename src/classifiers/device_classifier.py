@@ -2,6 +2,7 @@
 Device classification based on manufacturer and ports
 """
 
+from functools import lru_cache
 from rich.console import Console
 
 from ..config.settings import ROUTER_MANUFACTURERS, CAMERA_MANUFACTURERS, DEVICE_PORT_RULES
@@ -9,28 +10,46 @@ from ..scanners.port_scanner import get_http_headers
 
 console = Console()
 
+# Exact (lower-cased) vendor -> types; router entries win over camera ones
+VENDOR_TYPES = {
+    **{m.lower(): ('camera',) for m in CAMERA_MANUFACTURERS},
+    **{m.lower(): ('router',) for m in ROUTER_MANUFACTURERS},
+}
+
+# Substring rules applied in order when there is no exact vendor match
+VENDOR_SUBSTRING_RULES = (
+    (('apple', 'samsung', 'huawei', 'xiaomi', 'oneplus'), ('smartphone',)),
+    (('dell', 'hp', 'lenovo', 'asus', 'acer', 'msi'), ('computer',)),
+    (('canon', 'epson', 'hp', 'brother'), ('printer',)),
+    (('sony', 'lg', 'samsung', 'philips', 'panasonic'), ('tv', 'media-device')),
+)
+
+# Port -> bitmask over DEVICE_PORT_TYPES (bit i set if type i lists the port)
+DEVICE_PORT_TYPES = tuple(DEVICE_PORT_RULES)
+PORT_TYPE_MASKS = {}
+for _bit, _ports in enumerate(DEVICE_PORT_RULES.values()):
+    for _port in _ports:
+        PORT_TYPE_MASKS[_port] = PORT_TYPE_MASKS.get(_port, 0) | (1 << _bit)
+del _bit, _ports, _port
+
+
+@lru_cache(maxsize=4096)
+def _manufacturer_types(manufacturer_lower):
+    """Resolve device types for a lower-cased manufacturer (memoized)"""
+    if manufacturer_lower in VENDOR_TYPES:
+        return VENDOR_TYPES[manufacturer_lower]
+    for brands, device_types in VENDOR_SUBSTRING_RULES:
+        if any(brand in manufacturer_lower for brand in brands):
+            return device_types
+    return ()
+
 
 def classify_by_manufacturer(manufacturer):
     """Classify device by manufacturer"""
     if not manufacturer or manufacturer.lower() in ['unknown', 'not found']:
         return []
-        
-    manufacturer_lower = manufacturer.lower()
-    
-    if manufacturer_lower in [m.lower() for m in ROUTER_MANUFACTURERS]:
-        return ['router']
-    elif manufacturer_lower in [m.lower() for m in CAMERA_MANUFACTURERS]:
-        return ['camera']
-    elif any(brand in manufacturer_lower for brand in ['apple', 'samsung', 'huawei', 'xiaomi', 'oneplus']):
-        return ['smartphone']
-    elif any(brand in manufacturer_lower for brand in ['dell', 'hp', 'lenovo', 'asus', 'acer', 'msi']):
-        return ['computer']
-    elif any(brand in manufacturer_lower for brand in ['canon', 'epson', 'hp', 'brother']):
-        return ['printer']
-    elif any(brand in manufacturer_lower for brand in ['sony', 'lg', 'samsung', 'philips', 'panasonic']):
-        return ['tv', 'media-device']
-    else:
-        return []
+
+    return list(_manufacturer_types(manufacturer.lower()))
 
 
 def classify_by_ports(open_ports):
@@ -39,13 +58,11 @@ def classify_by_ports(open_ports):
         return ['unknown']
         
     try:
-        open_ports_int = list(map(int, open_ports))
-        device_types = []
+        mask = 0
+        for port in open_ports:
+            mask |= PORT_TYPE_MASKS.get(int(port), 0)
 
-        for dev_type, ports in DEVICE_PORT_RULES.items():
-            if any(port in open_ports_int for port in ports):
-                device_types.append(dev_type)
-        
+        device_types = [dev_type for bit, dev_type in enumerate(DEVICE_PORT_TYPES) if mask >> bit & 1]
         return device_types or ['unknown']
     except (ValueError, TypeError):
         return ['unknown']
@@ -78,11 +95,14 @@ def classify_by_http(headers):
         return []
 
 
-def classify_device(device):
+def classify_device(device, http_headers=None):
     """Main device classification method"""
+    # Imported here: the core package imports this module
+    from ..core.device import get_open_ports
+
     try:
         manufacturer = device.get("manufacturer", "").strip()
-        open_ports = device.get("open ports", [])
+        open_ports = get_open_ports(device)
 
         classifications = []
 
@@ -94,9 +114,13 @@ def classify_device(device):
         port_types = classify_by_ports(open_ports)
         classifications.extend(port_types)
 
-        # Classify by HTTP headers if web ports are open
-        if open_ports and any(str(port) in ['80', '443'] for port in open_ports):
-            headers = get_http_headers(device.get("ip", ""))
+        # Classify by HTTP headers, fetching them here unless already fingerprinted
+        if http_headers is None:
+            http_headers = []
+            if any(port in (80, 443) for port in open_ports):
+                http_headers.append(get_http_headers(device.get("ip", "")))
+
+        for headers in http_headers:
             http_types = classify_by_http(headers)
             if http_types:
                 classifications.extend(http_types)
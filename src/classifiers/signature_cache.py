@@ -0,0 +1,188 @@
+"""
+Validated signature compilation with an on-disk cache
+"""
+
+import os
+import sys
+import hashlib
+import marshal
+from rich.console import Console
+
+from ..config.settings import MAIN_COLOR, SIGNATURES_PATH, SIGNATURE_CACHE_SUFFIX
+from .signature_matcher import SignatureIndex, _normalize_key
+
+console = Console()
+
+# Bump when the cached layout or the validation rules change
+SIGNATURE_CACHE_VERSION = 1
+
+RISK_LEVELS = ('Low', 'Medium', 'High', 'Critical')
+TEXT_FIELDS = ('name', 'description', 'risk_level', 'cve_info')
+CONDITION_FIELDS = ('manufacturer', 'ports', 'device_type')
+
+
+def get_cache_path(filename):
+    """Get the compiled cache path for a signatures file"""
+    return filename + SIGNATURE_CACHE_SUFFIX
+
+
+def _name_list(value, field):
+    """Validate a manufacturer or device type condition"""
+    if isinstance(value, str):
+        value = [value]
+    if not isinstance(value, list) or not all(isinstance(item, str) and item.strip() for item in value):
+        raise ValueError(f"'{field}' must be a name or a list of names")
+    # Keep the first spelling of names that only differ in case
+    names = {}
+    for item in value:
+        names.setdefault(_normalize_key(item), item.strip())
+    return list(names.values())
+
+
+def _port_list(value):
+    """Validate a ports condition into sorted unique integers"""
+    if not isinstance(value, list):
+        value = [value]
+    ports = set()
+    for port in value:
+        if isinstance(port, bool) or not isinstance(port, (int, str)):
+            raise ValueError(f"invalid port {port!r}")
+        try:
+            port = int(port)
+        except ValueError:
+            raise ValueError(f"invalid port {port!r}") from None
+        if not 0 < port < 65536:
+            raise ValueError(f"port out of range: {port}")
+        ports.add(port)
+    return sorted(ports)
+
+
+def normalize_signature(signature):
+    """Check a signature against the schema and bring it to canonical form
+
+    Raises ValueError describing the first problem found.
+    """
+    if not isinstance(signature, dict):
+        raise ValueError("signature must be a mapping")
+
+    unknown = set(signature) - set(TEXT_FIELDS) - {'conditions'}
+    if unknown:
+        raise ValueError(f"unknown field(s): {', '.join(sorted(map(str, unknown)))}")
+
+    normalized = {}
+    for field in TEXT_FIELDS:
+        if field in signature:
+            if not isinstance(signature[field], str):
+                raise ValueError(f"'{field}' must be text")
+            normalized[field] = signature[field].strip()
+
+    if not normalized.get('name'):
+        raise ValueError("missing 'name'")
+    if 'risk_level' in normalized and normalized['risk_level'] not in RISK_LEVELS:
+        raise ValueError(f"'risk_level' must be one of {', '.join(RISK_LEVELS)}")
+
+    conditions = signature.get('conditions') or {}
+    if not isinstance(conditions, dict):
+        raise ValueError("'conditions' must be a mapping")
+    unknown = set(conditions) - set(CONDITION_FIELDS)
+    if unknown:
+        raise ValueError(f"unknown condition(s): {', '.join(sorted(map(str, unknown)))}")
+
+    normalized['conditions'] = {}
+    for field, value in conditions.items():
+        if value is None:
+            continue
+        normalized['conditions'][field] = _port_list(value) if field == 'ports' else _name_list(value, field)
+
+    return normalized
+
+
+def compile_signature_data(signatures):
+    """Validate raw signatures into a SignatureIndex, skipping invalid ones
+
+    Returns the index and a list of schema error messages.
+    """
+    valid = []
+    errors = []
+
+    if not isinstance(signatures, list):
+        return SignatureIndex([]), ["'signatures' must be a list"]
+
+    for number, signature in enumerate(signatures, 1):
+        try:
+            valid.append(normalize_signature(signature))
+        except ValueError as e:
+            name = signature.get('name') if isinstance(signature, dict) else None
+            errors.append(f"signature {number}{f' ({name})' if name else ''}: {e}")
+
+    return SignatureIndex(valid), errors
+
+
+def _cache_key(filename, content):
+    """Identify a signatures file version and the interpreter reading the cache"""
+    return (
+        SIGNATURE_CACHE_VERSION,
+        sys.version_info[:2],
+        os.path.abspath(filename),
+        os.stat(filename).st_mtime_ns,
+        hashlib.blake2b(content, digest_size=16).digest(),
+    )
+
+
+def _read_cache(cache_path, key):
+    """Load a cached index if it was compiled from the same file, else None"""
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = marshal.loads(f.read())
+        if cached['key'] != key:
+            return None
+        return SignatureIndex.from_state(cached['index']), cached['errors']
+    except (OSError, ValueError, EOFError, TypeError, KeyError):
+        return None
+
+
+def _write_cache(cache_path, key, index, errors):
+    """Store a compiled index; an unwritable config directory only costs speed"""
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(marshal.dumps({'key': key, 'index': index.to_state(), 'errors': errors}))
+        os.replace(tmp_path, cache_path)
+    except (OSError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def load_signature_index(filename=None):
+    """Load signatures as a compiled index, reusing the cache while the file is unchanged"""
+    if filename is None:
+        filename = SIGNATURES_PATH
+
+    try:
+        with open(filename, 'rb') as f:
+            content = f.read()
+        key = _cache_key(filename, content)
+    except OSError:
+        console.print(f":x: [bold red]File not found:[/bold red] {filename}", style=MAIN_COLOR)
+        return SignatureIndex([])
+
+    cache_path = get_cache_path(filename)
+    cached = _read_cache(cache_path, key)
+    if cached:
+        index, errors = cached
+    else:
+        from ..config.signature_loader import parse_signatures
+
+        try:
+            index, errors = compile_signature_data(parse_signatures(content))
+        except Exception as e:
+            console.print(f":x: [bold red]Error loading signatures:[/bold red] {e}", style=MAIN_COLOR)
+            return SignatureIndex([])
+        _write_cache(cache_path, key, index, errors)
+
+    for error in errors:
+        console.print(f":warning: [bold yellow]Invalid signature skipped:[/bold yellow] {error}", style=MAIN_COLOR)
+    console.print(f":bookmark_tabs: [bold green]{len(index)} signatures loaded[/bold green]", style=MAIN_COLOR)
+    return index
@@ -9,25 +9,118 @@ from ..config.settings import MAIN_COLOR
 console = Console()
 
 
+def _normalize_key(value):
+    """Normalize a manufacturer or device type for index lookups"""
+    return str(value).strip().casefold()
+
+
+def _iter_bits(bits):
+    """Yield set bit positions in ascending order"""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+class SignatureIndex:
+    """Signatures compiled into per-condition inverted indexes of bitsets
+
+    Bit i of every bitset stands for signature i. A condition a signature does
+    not specify is recorded in the matching `any_*` bitset, so each device is
+    matched with one lookup and a few ORs/ANDs per condition.
+    """
+
+    STATE_FIELDS = ('signatures', 'by_manufacturer', 'by_port', 'by_device_type',
+                    'any_manufacturer', 'any_port', 'any_device_type')
+
+    def __init__(self, signatures):
+        self.signatures = list(signatures)
+        self.by_manufacturer = {}
+        self.by_port = {}
+        self.by_device_type = {}
+        self.any_manufacturer = 0
+        self.any_port = 0
+        self.any_device_type = 0
+
+        for index, sig in enumerate(self.signatures):
+            bit = 1 << index
+            conditions = sig.get('conditions') or {}
+
+            manufacturers = conditions.get('manufacturer') or []
+            for manufacturer in manufacturers:
+                key = _normalize_key(manufacturer)
+                self.by_manufacturer[key] = self.by_manufacturer.get(key, 0) | bit
+            if not manufacturers:
+                self.any_manufacturer |= bit
+
+            ports = conditions.get('ports') or []
+            for port in map(int, ports):
+                self.by_port[port] = self.by_port.get(port, 0) | bit
+            if not ports:
+                self.any_port |= bit
+
+            device_types = conditions.get('device_type') or []
+            for device_type in device_types:
+                key = _normalize_key(device_type)
+                self.by_device_type[key] = self.by_device_type.get(key, 0) | bit
+            if not device_types:
+                self.any_device_type |= bit
+
+    def match(self, device):
+        """Get signatures matching a device, in signature file order"""
+        # Imported here: the core package imports the classifiers
+        from ..core.device import get_open_ports
+
+        candidates = self.by_manufacturer.get(_normalize_key(device.get('manufacturer', '')), 0) | self.any_manufacturer
+        if not candidates:
+            return []
+
+        port_bits = self.any_port
+        for port in get_open_ports(device):
+            port_bits |= self.by_port.get(port, 0)
+        candidates &= port_bits
+        if not candidates:
+            return []
+
+        type_bits = self.any_device_type
+        for device_type in device.get('device type', []):
+            type_bits |= self.by_device_type.get(_normalize_key(device_type), 0)
+        candidates &= type_bits
+
+        return [self.signatures[index] for index in _iter_bits(candidates)]
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def to_state(self):
+        """Get the compiled index as plain data that marshal can store"""
+        return {field: getattr(self, field) for field in self.STATE_FIELDS}
+
+    @classmethod
+    def from_state(cls, state):
+        """Rebuild an index from to_state() data without recompiling"""
+        index = cls.__new__(cls)
+        for field in cls.STATE_FIELDS:
+            setattr(index, field, state[field])
+        return index
+
+
+def compile_signatures(signatures):
+    """Compile loaded signatures into a SignatureIndex"""
+    if isinstance(signatures, SignatureIndex):
+        return signatures
+    return SignatureIndex(signatures or [])
+
+
 def check_against_signatures(device, signatures):
     """Check if device matches any signatures"""
-    matched = []
-    
-    for sig in signatures:
-        manufacturers = sig['conditions'].get('manufacturer', [])
-        ports = list(map(int, sig['conditions'].get('ports', [])))
-
-        # Check manufacturer match
-        if manufacturers and device['manufacturer'] not in manufacturers:
-            continue
-            
-        # Check port match
-        if ports and not any(port in ports for port in map(int, device['open ports'])):
-            continue
-        
-        matched.append(sig)
-    
-    return matched
+    return compile_signatures(signatures).match(device)
+
+
+def match_devices(devices, signatures):
+    """Match every device of a scan against compiled signatures"""
+    index = compile_signatures(signatures)
+    return [index.match(device) for device in devices]
 
 
 def print_matches(device, matches):
@@ -38,4 +131,4 @@ def print_matches(device, matches):
             console.print(f"    → {match.get('name', 'No name')}", style=MAIN_COLOR)
             console.print(f"      {match.get('description', 'No description')}", style=MAIN_COLOR)
             if match.get('cve_info'):
-                console.print(f"      CVE: {match.get('cve_info')}", style="red") 
\ No newline at end of file
+                console.print(f"      CVE: {match.get('cve_info')}", style="red")
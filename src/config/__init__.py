@@ -2,11 +2,24 @@
 Configuration module
 """
 
+import importlib
+
 from .settings import *
-from .signature_loader import load_signatures, get_signatures, reload_signatures
 
-__all__ = [
-    'load_signatures',
-    'get_signatures', 
-    'reload_signatures'
-] 
\ No newline at end of file
+# Signature loading needs PyYAML, so it is only imported when used
+_EXPORTS = {
+    'parse_signatures': 'signature_loader',
+    'load_signatures': 'signature_loader',
+    'get_signatures': 'signature_loader',
+    'reload_signatures': 'signature_loader',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
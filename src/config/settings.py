@@ -10,10 +10,16 @@ MAIN_COLOR = "#B0E0E6"
 # Telegram settings
 TELEGRAM_BOT_TOKEN = "7840082685:AAEKTFSUjMa9CoXaNhBn9t8ONHAH_hJCQqo"
 AUTHORIZED_USER_ID = 815330161
+TELEGRAM_API_URL = "https://api.telegram.org"  # point at a local stand-in server for testing
+TELEGRAM_TIMEOUT = 10  # seconds per Bot API request
+TELEGRAM_MESSAGE_LIMIT = 4096  # characters per message, set by Telegram
+TELEGRAM_MAX_MESSAGES = 5  # longer results are sent as a compressed document
+TELEGRAM_MAX_RETRIES = 4
+TELEGRAM_FLUSH_TIMEOUT = 30  # seconds to wait for queued notifications on exit
 
 # Network settings
 DEFAULT_SUBNET = "192.168.1.0/24"
-SCAN_TIMEOUT = 50  # milliseconds
+SCAN_TIMEOUT = 50  # milliseconds, nmap --host-timeout of host discovery
 MIN_HOSTGROUP = 20
 MAX_RETRIES = 3
 
@@ -208,26 +214,63 @@ RISK_THRESHOLDS = {
 
 # File paths
 OUI_DB_PATH = "data/oui.txt"
+MAM_DB_PATH = "data/mam.txt"  # IEEE MA-M (28-bit) registry
+OUI36_DB_PATH = "data/oui36.txt"  # IEEE MA-S (36-bit) registry
+NEIGHBOR_TABLE_PATH = "/proc/net/arp"
 SIGNATURES_PATH = "config/signatures.yaml"
+SIGNATURE_CACHE_SUFFIX = ".cache"  # compiled signatures are cached next to the YAML file
 HISTORY_DIR = "history"
+HISTORY_DB_PATH = "history/history.db"
+HISTORY_BACKEND = "sqlite"  # "sqlite" or "json"
 EXPORT_DIR = "exportable_reports"
 
 # Performance settings
 MAX_WORKERS = 10
-CONNECTION_TIMEOUT = 5
+PORT_SCAN_CHUNK_SIZE = 256  # hosts per nmap port scan invocation
+ASYNC_SCAN_CONCURRENCY = 2000  # simultaneous connects for the asyncio engine
+DEFAULT_SCAN_ENGINE = "nmap"
+CONNECTION_TIMEOUT = 1  # seconds per connect for the asyncio engine unless --timeout is given
 HTTP_TIMEOUT = 3
+HTTP_MAX_CONCURRENCY = 32  # simultaneous HTTP fingerprint requests per scan
+
+# Web ports probed for HTTP fingerprinting and the scheme they speak
+HTTP_PORTS = {
+    80: 'http',
+    8000: 'http',
+    8080: 'http',
+    8081: 'http',
+    443: 'https',
+    8443: 'https',
+}
 
 # Logging settings
 LOG_LEVEL = "INFO"
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
+# Discovery pipeline: hosts are handed to workers in small batches as found
+PIPELINE_BATCH_SIZE = 32
+PIPELINE_BATCH_WAIT = 0.5  # seconds to wait for more hosts after the first
+PIPELINE_QUEUE_SIZE = 1024
+
 # Scan settings
-SCAN_BATCH_SIZE = 50
+SCAN_BATCH_SIZE = 256  # addresses per shard in sharded mode
 SCAN_DELAY = 0.1  # seconds between scans
 
+# Prometheus textfile for the node_exporter textfile collector, e.g.
+# /var/lib/node_exporter/textfile_collector/port_phantom.prom
+METRICS_TEXTFILE = None
+
+# --profile reports
+PROFILE_TOP_N = 25  # hotspot and allocation site rows
+PROFILE_TRACE_FRAMES = 1  # tracemalloc frames per allocation; more is slower
+
+# Daemon mode
+DAEMON_INTERVAL = 600  # seconds between scans of the same subnet
+DAEMON_JITTER = 30  # random extra delay in seconds, spreads load across subnets
+
 def load_settings_from_env():
     """Load settings from environment variables"""
-    global TELEGRAM_BOT_TOKEN, AUTHORIZED_USER_ID, SCAN_TIMEOUT, MAX_WORKERS
+    global TELEGRAM_BOT_TOKEN, AUTHORIZED_USER_ID, TELEGRAM_API_URL, SCAN_TIMEOUT, MAX_WORKERS
     
     if os.getenv('TELEGRAM_BOT_TOKEN'):
         TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
@@ -235,6 +278,9 @@ def load_settings_from_env():
     if os.getenv('AUTHORIZED_USER_ID'):
         AUTHORIZED_USER_ID = int(os.getenv('AUTHORIZED_USER_ID'))
     
+    if os.getenv('TELEGRAM_API_URL'):
+        TELEGRAM_API_URL = os.getenv('TELEGRAM_API_URL').rstrip('/')
+    
     if os.getenv('SCAN_TIMEOUT'):
         SCAN_TIMEOUT = int(os.getenv('SCAN_TIMEOUT'))
     
@@ -3,7 +3,6 @@ Signature loading and management
 """
 
 import os
-import yaml
 from rich.console import Console
 
 from .settings import MAIN_COLOR, SIGNATURES_PATH
@@ -11,8 +10,23 @@ from .settings import MAIN_COLOR, SIGNATURES_PATH
 console = Console()
 
 
+def parse_signatures(content):
+    """Parse the signature list out of YAML text or bytes"""
+    import yaml
+
+    # The libyaml-backed loader is many times faster when PyYAML was built with it
+    data = yaml.load(content, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+    if data is None:
+        return []
+    if not isinstance(data, dict):
+        raise ValueError("expected a mapping with a 'signatures' list at the top level")
+    return data.get('signatures') or []
+
+
 def load_signatures(filename=None):
     """Load signatures from YAML file"""
+    import yaml
+
     if filename is None:
         filename = SIGNATURES_PATH
     
@@ -22,8 +36,7 @@ def load_signatures(filename=None):
     
     try:
         with open(filename, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-            signatures = data.get('signatures', [])
+            signatures = parse_signatures(f)
             console.print(f":bookmark_tabs: [bold green]{len(signatures)} signatures loaded[/bold green]", style=MAIN_COLOR)
             return signatures
     except yaml.YAMLError as e:
@@ -2,14 +2,34 @@
 Core processing modules
 """
 
-from .device_processor import process_ip, process_network, create_empty_device
-from .risk_assessor import calculate_risk_score, get_risk_level, assess_device_risk
-
-__all__ = [
-    'process_ip',
-    'process_network',
-    'create_empty_device',
-    'calculate_risk_score',
-    'get_risk_level',
-    'assess_device_risk'
-] 
\ No newline at end of file
+import importlib
+
+# Public name -> defining submodule, imported on first access
+_EXPORTS = {
+    'Device': 'device',
+    'get_open_ports': 'device',
+    'process_ip': 'device_processor',
+    'process_batch': 'device_processor',
+    'process_network': 'device_processor',
+    'create_empty_device': 'device_processor',
+    'parse_max_age': 'scan_cache',
+    'build_scan_cache': 'scan_cache',
+    'get_cached_device': 'scan_cache',
+    'split_targets': 'shard_scanner',
+    'scan_sharded': 'shard_scanner',
+    'ScanScheduler': 'scheduler',
+    'parse_schedule': 'scheduler',
+    'calculate_risk_score': 'risk_assessor',
+    'get_risk_level': 'risk_assessor',
+    'assess_device_risk': 'risk_assessor',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
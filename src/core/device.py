@@ -0,0 +1,132 @@
+"""
+Compact device model
+"""
+
+import sys
+from array import array
+from collections.abc import MutableMapping
+
+# Shared tuples for identical device type lists
+_type_tuples = {}
+
+
+def intern_types(device_types):
+    """Get a shared, interned tuple for a list of device types"""
+    key = tuple(sys.intern(str(device_type)) for device_type in device_types)
+    return _type_tuples.setdefault(key, key)
+
+
+def get_open_ports(device):
+    """Get a device's open ports as integers"""
+    if isinstance(device, Device):
+        return device.ports
+    return [int(port) for port in device.get('open ports', [])]
+
+
+class Device(MutableMapping):
+    """Scanned device stored in slots with ports as a sorted uint16 array
+
+    Behaves as a mapping with the JSON schema keys ("open ports",
+    "device type", ...), so `device['level']` and `device.get('ip')` keep
+    working and `dict(device)` gives the JSON form back.
+    """
+
+    __slots__ = ('ip', 'mac', 'manufacturer', 'ports', 'device_types', 'score', 'level', 'scanned_at', 'extra')
+
+    CORE_KEYS = ('ip', 'mac', 'manufacturer', 'open ports', 'device type', 'score', 'level')
+
+    def __init__(self, ip, mac="Not found", manufacturer="Unknown", ports=(), device_types=("unknown",),
+                 score=0, level="None", scanned_at=None, extra=None):
+        self.ip = ip
+        self.mac = mac
+        self.manufacturer = sys.intern(manufacturer) if isinstance(manufacturer, str) else manufacturer
+        self.ports = array('H', sorted(int(port) for port in ports))
+        self.device_types = intern_types(device_types)
+        self.score = score
+        self.level = level
+        self.scanned_at = scanned_at
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a device from its JSON dict form"""
+        extra = {key: value for key, value in data.items() if key not in cls.CORE_KEYS and key != 'scanned_at'}
+        return cls(
+            data.get('ip'),
+            data.get('mac', "Not found"),
+            data.get('manufacturer', "Unknown"),
+            data.get('open ports', ()),
+            data.get('device type', ("unknown",)),
+            data.get('score', 0),
+            data.get('level', "None"),
+            data.get('scanned_at'),
+            extra
+        )
+
+    def to_dict(self):
+        """Get the JSON dict form of the device"""
+        return dict(self)
+
+    def __getitem__(self, key):
+        if key == 'ip':
+            return self.ip
+        if key == 'mac':
+            return self.mac
+        if key == 'manufacturer':
+            return self.manufacturer
+        if key == 'open ports':
+            return [str(port) for port in self.ports]
+        if key == 'device type':
+            return list(self.device_types)
+        if key == 'score':
+            return self.score
+        if key == 'level':
+            return self.level
+        if key == 'scanned_at' and self.scanned_at is not None:
+            return self.scanned_at
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key == 'ip':
+            self.ip = value
+        elif key == 'mac':
+            self.mac = value
+        elif key == 'manufacturer':
+            self.manufacturer = sys.intern(value) if isinstance(value, str) else value
+        elif key == 'open ports':
+            self.ports = array('H', sorted(int(port) for port in value))
+        elif key == 'device type':
+            self.device_types = intern_types(value)
+        elif key == 'score':
+            self.score = value
+        elif key == 'level':
+            self.level = value
+        elif key == 'scanned_at':
+            self.scanned_at = value
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key == 'scanned_at' and self.scanned_at is not None:
+            self.scanned_at = None
+        elif self.extra and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        yield from self.CORE_KEYS
+        if self.scanned_at is not None:
+            yield 'scanned_at'
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return len(self.CORE_KEYS) + (self.scanned_at is not None) + len(self.extra or ())
+
+    def __repr__(self):
+        return f"Device({self.to_dict()!r})"
@@ -2,61 +2,79 @@
 Device processing and information gathering
 """
 
+import queue
+import importlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 
-from ..config.settings import MAIN_COLOR
-from ..scanners.network_scanner import scan_network
+from ..config.settings import (
+    MAIN_COLOR, MAX_WORKERS, DEFAULT_SCAN_ENGINE,
+    PIPELINE_BATCH_SIZE, PIPELINE_BATCH_WAIT, PIPELINE_QUEUE_SIZE
+)
+from ..scanners.network_scanner import iter_active_hosts
 from ..scanners.port_scanner import check_ports
-from ..scanners.mac_scanner import get_mac_address, get_oui, get_manufacturer
+from ..scanners.http_scanner import fingerprint_hosts
+from ..scanners.mac_scanner import get_mac_address, get_mac_addresses, get_oui, get_manufacturer
 from ..classifiers.device_classifier import classify_device
+from ..utils.metrics import metrics
+from .device import Device
 from .risk_assessor import assess_device_risk
+from .scan_cache import get_cached_device
 
 console = Console()
 
+# Batch port scan implementations selectable with --engine, imported when
+# first used so the nmap engine never loads asyncio
+PORT_SCAN_ENGINES = {
+    "nmap": ("..scanners.port_scanner", "check_ports_batch"),
+    "asyncio": ("..scanners.connect_scanner", "connect_scan_batch"),
+}
+
+
+def get_port_scan_engine(engine=None):
+    """Get the batch port scan function of an engine"""
+    module, function = PORT_SCAN_ENGINES[engine or DEFAULT_SCAN_ENGINE]
+    return getattr(importlib.import_module(module, __package__), function)
+
 
 def create_empty_device(ip):
     """Create empty device when MAC is not found"""
-    return {
-        "ip": ip,
-        "mac": "Not found",
-        "manufacturer": "Unknown",
-        "open ports": [],
-        "device type": ["unknown"],
-        "score": 0,
-        "level": "None"
-    }
-
-
-def process_ip(ip, oui_db, ports=None):
+    return Device(ip)
+
+
+def process_ip(ip, oui_db, ports=None, open_ports=None, mac=None, http_headers=None):
     """Process a single IP address"""
     try:
-        # Get MAC address
-        mac = get_mac_address(ip)
+        # Get MAC address unless the bulk neighbor lookup already resolved it
+        if mac is None:
+            with metrics.span('neighbors'):
+                mac = get_mac_address(ip)
         if not mac:
             return create_empty_device(ip)
         
-        # Get open ports
-        open_ports = check_ports(ip, ports)
+        # Get open ports unless a batch scan already provided them
+        if open_ports is None:
+            with metrics.span('ports'):
+                open_ports = check_ports(ip, ports)
         
         # Get manufacturer
         oui = get_oui(mac)
         manufacturer = get_manufacturer(oui, oui_db)
         
         # Create device object
-        device = {
-            "ip": ip,
-            "mac": mac,
-            "manufacturer": manufacturer,
-            "open ports": open_ports
-        }
+        device = Device(ip, mac, manufacturer, open_ports, scanned_at=int(time.time()))
         
         # Classify device
-        device_types = classify_device(device)
+        with metrics.span('classify'):
+            device_types = classify_device(device, http_headers)
         device['device type'] = device_types
         
         # Assess risk
-        device = assess_device_risk(device)
+        with metrics.span('risk'):
+            device = assess_device_risk(device)
         
         return device
         
@@ -65,19 +83,103 @@ def process_ip(ip, oui_db, ports=None):
         return create_empty_device(ip)
 
 
-def process_network(subnet, oui_db, ports=None):
-    """Process entire network"""
-    # Find active hosts
-    active_ips = scan_network(subnet)
-    
-    if not active_ips:
-        console.print(":x: [bold red]No active devices found[/bold red]", style=MAIN_COLOR)
-        return []
-    
-    console.print(f":gear: [bold green]Processing {len(active_ips)} devices...[/bold green]", style=MAIN_COLOR)
-    
-    # Process each device with progress bar
+def prepare_batch(batch, ports=None, engine=None, mac_map=None, timeout=None):
+    """Resolve MAC addresses, open ports and HTTP headers for a batch of hosts
+
+    timeout is the per-connection port scan timeout in seconds.
+    """
+    # One neighbor table read, one port scan and one fingerprint pass per batch
+    if mac_map is None:
+        with metrics.span('neighbors', len(batch)):
+            mac_map = get_mac_addresses(batch)
+    scan_ports = get_port_scan_engine(engine)
+    with metrics.span('ports', len(batch)):
+        port_map = scan_ports(batch, ports, timeout)
+    web_hosts = {ip: port_map[ip] for ip in batch if mac_map.get(ip)}
+    with metrics.span('http', len(web_hosts)):
+        http_map = fingerprint_hosts(web_hosts)
+    return mac_map, port_map, http_map
+
+
+def process_batch(batch, oui_db, ports=None, engine=None, cache=None, timeout=None):
+    """Process a batch of discovered hosts, reusing fresh cached results"""
+    try:
+        with metrics.span('neighbors', len(batch)):
+            mac_map = get_mac_addresses(batch)
+        cached = {ip: get_cached_device(cache, ip, mac_map.get(ip)) for ip in batch}
+        metrics.count('cached_hosts', sum(1 for device in cached.values() if device is not None))
+
+        # Hosts without a MAC address end up as empty devices, so skip scanning them
+        to_scan = [ip for ip in batch if cached[ip] is None and mac_map.get(ip)]
+        port_map, http_map = {}, {}
+        if to_scan:
+            _, port_map, http_map = prepare_batch(to_scan, ports, engine, mac_map, timeout)
+    except Exception as e:
+        console.print(f":x: [bold red]Error processing batch of {len(batch)} hosts:[/bold red] {e}", style=MAIN_COLOR)
+        return [create_empty_device(ip) for ip in batch]
+
     devices = []
+    for ip in batch:
+        if cached[ip] is not None:
+            devices.append(cached[ip])
+        elif ip in port_map:
+            devices.append(process_ip(ip, oui_db, ports, port_map[ip], mac_map[ip], http_map.get(ip)))
+        else:
+            devices.append(create_empty_device(ip))
+    return devices
+
+
+def discover_hosts(subnet, host_queue):
+    """Push hosts onto a queue as the discovery sweep reports them"""
+    start = time.perf_counter()
+    found = 0
+    try:
+        for ip in iter_active_hosts(subnet):
+            host_queue.put(ip)
+            found += 1
+    except Exception as e:
+        console.print(f":x: [bold red]Error scanning network:[/bold red] {e}", style=MAIN_COLOR)
+    finally:
+        metrics.observe('discovery', time.perf_counter() - start, found)
+        host_queue.put(None)
+
+
+def iter_host_batches(host_queue, batch_size=None, batch_wait=None):
+    """Group queued hosts into batches, waiting briefly for more after the first"""
+    batch_size = batch_size or PIPELINE_BATCH_SIZE
+    batch_wait = PIPELINE_BATCH_WAIT if batch_wait is None else batch_wait
+
+    while True:
+        ip = host_queue.get()
+        if ip is None:
+            return
+
+        batch = [ip]
+        deadline = time.monotonic() + batch_wait
+        while len(batch) < batch_size:
+            try:
+                ip = host_queue.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if ip is None:
+                yield batch
+                return
+            batch.append(ip)
+
+        yield batch
+
+
+def process_network(subnet, oui_db, ports=None, workers=None, engine=None, cache=None, timeout=None):
+    """Process entire network, overlapping host discovery with per-host work"""
+    host_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    producer = threading.Thread(target=discover_hosts, args=(subnet, host_queue), daemon=True)
+    producer.start()
+
+    console.print(":gear: [bold green]Processing devices as they are discovered...[/bold green]", style=MAIN_COLOR)
+
+    # Batches are processed concurrently; results keep discovery order
+    futures = []
+    discovered = 0
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
@@ -86,16 +188,30 @@ def process_network(subnet, oui_db, ports=None):
         console=console
     ) as progress:
         
-        task = progress.add_task("Processing devices...", total=len(active_ips))
+        task = progress.add_task("Processing devices...", total=None)
         
-        for ip in active_ips:
-            device = process_ip(ip, oui_db, ports)
-            devices.append(device)
-            progress.update(task, advance=1)
+        with ThreadPoolExecutor(max_workers=max(1, workers or MAX_WORKERS)) as executor:
+            for batch in iter_host_batches(host_queue):
+                discovered += len(batch)
+                progress.update(task, total=discovered)
+                future = executor.submit(process_batch, batch, oui_db, ports, engine, cache, timeout)
+                future.add_done_callback(lambda _, size=len(batch): progress.update(task, advance=size))
+                futures.append(future)
+
+    if not discovered:
+        console.print(":x: [bold red]No active devices found[/bold red]", style=MAIN_COLOR)
+        return []
+
+    console.print(f":mag: [bold green]{discovered} active devices found[/bold green]", style=MAIN_COLOR)
+    devices = [device for future in futures for device in future.result()]
+
+    if cache:
+        reused = sum(1 for device in devices if device == cache.get(device['ip']))
+        console.print(f":recycle: [bold green]Reused cached results for {reused} of {len(devices)} devices[/bold green]", style=MAIN_COLOR)
     
     # Filter out devices with errors
     valid_devices = [d for d in devices if d.get('mac') != 'Not found']
     if len(valid_devices) != len(devices):
         console.print(f":warning: [yellow]Processed {len(devices)} devices, {len(valid_devices)} with valid data[/yellow]", style=MAIN_COLOR)
     
-    return devices 
\ No newline at end of file
+    return devices
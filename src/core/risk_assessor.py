@@ -5,6 +5,7 @@ Risk assessment and scoring
 from rich.console import Console
 
 from ..config.settings import RISK_RULES
+from .device import get_open_ports
 
 console = Console()
 
@@ -13,7 +14,7 @@ def calculate_risk_score(device):
     """Calculate risk score for a device"""
     risk_score = 0
     manufacturer = device.get("manufacturer", "").strip()
-    open_ports = list(map(int, device.get("open ports", [])))
+    open_ports = get_open_ports(device)
 
     # Add port-based risk
     for port in open_ports:
@@ -0,0 +1,64 @@
+"""
+Reuse of recent per-host results for incremental scans
+"""
+
+import argparse
+import time
+
+from .device import Device
+
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_max_age(value):
+    """Parse a duration such as 90, 90s, 15m, 1h or 2d into seconds"""
+    value = str(value).strip().lower()
+    unit = DURATION_UNITS.get(value[-1:], None)
+    number = value[:-1] if unit else value
+
+    try:
+        seconds = float(number) * (unit or 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid duration: {value!r} (use e.g. 90s, 15m, 1h)")
+
+    if seconds <= 0:
+        raise argparse.ArgumentTypeError(f"duration must be positive: {value!r}")
+    return seconds
+
+
+def get_scan_time(scan_data):
+    """Get a saved scan's timestamp as epoch seconds"""
+    try:
+        return time.mktime(time.strptime(scan_data['timestamp'], "%Y-%m-%d %H:%M:%S"))
+    except (KeyError, TypeError, ValueError):
+        return 0
+
+
+def build_scan_cache(previous_data, max_age, ports):
+    """Build an ip -> device map of previous results still younger than max_age
+
+    Results are only reusable when the previous scan probed the same ports.
+    """
+    if not previous_data or previous_data.get('ports') != sorted(ports):
+        return {}
+
+    scan_time = get_scan_time(previous_data)
+    oldest = time.time() - max_age
+
+    cache = {}
+    for device in previous_data.get('devices', []):
+        if device.get('mac') in (None, '', 'Not found'):
+            continue
+        # Reused results keep their original scan time so they still expire
+        device.setdefault('scanned_at', int(scan_time))
+        if device['scanned_at'] >= oldest:
+            cache[device['ip']] = device
+    return cache
+
+
+def get_cached_device(cache, ip, mac):
+    """Get a Device copy of the cached device for ip if its MAC is unchanged"""
+    device = cache.get(ip) if cache else None
+    if device is None or not mac or device.get('mac') != mac:
+        return None
+    return Device.from_dict(device)
@@ -0,0 +1,65 @@
+"""
+Interval scheduler for daemon mode
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from rich.console import Console
+
+from ..config.settings import MAIN_COLOR
+from .scan_cache import parse_max_age
+
+console = Console()
+
+
+def parse_schedule(targets, default_interval):
+    """Split 'SUBNET[@INTERVAL],...' into (subnet, seconds) pairs"""
+    schedule = []
+    for target in targets.split(','):
+        subnet, _, interval = target.strip().partition('@')
+        if subnet:
+            schedule.append((subnet, parse_max_age(interval) if interval else default_interval))
+    return schedule
+
+
+class ScanScheduler:
+    """Run jobs at per-name intervals with random jitter, one at a time
+
+    Jobs never overlap: a run that outlasts its interval is followed by the
+    next one immediately instead of being started concurrently.
+    """
+
+    def __init__(self, jitter=0):
+        self.jitter = jitter
+        self._queue = []
+        self._order = itertools.count()
+        self._stopped = threading.Event()
+
+    def add(self, name, interval, first_run=None):
+        """Schedule a recurring job, due immediately unless first_run is given"""
+        due = time.time() if first_run is None else first_run
+        heapq.heappush(self._queue, (due, next(self._order), name, interval))
+
+    def stop(self):
+        """Stop after the job currently running, if any"""
+        self._stopped.set()
+
+    def run(self, job):
+        """Call job(name) whenever a name is due, until stopped"""
+        while self._queue and not self._stopped.is_set():
+            due, _, name, interval = heapq.heappop(self._queue)
+            if self._stopped.wait(max(0, due - time.time())):
+                break
+
+            started = time.time()
+            try:
+                job(name)
+            except Exception as e:
+                console.print(f":x: [bold red]Scheduled scan of {name} failed:[/bold red] {e}", style=MAIN_COLOR)
+
+            next_run = max(started + interval, time.time()) + random.uniform(0, self.jitter)
+            heapq.heappush(self._queue, (next_run, next(self._order), name, interval))
+            console.print(f":alarm_clock: [bold green]Next scan of {name} at[/bold green] {time.strftime('%H:%M:%S', time.localtime(next_run))}", style=MAIN_COLOR)
@@ -0,0 +1,122 @@
+"""
+Sharded scanning of large targets with bounded memory
+"""
+
+import ipaddress
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from rich.console import Console
+
+from ..config.settings import MAIN_COLOR, SCAN_BATCH_SIZE, SCAN_DELAY
+from ..scanners.mac_scanner import load_oui_db
+from ..utils.metrics import metrics
+from .device_processor import process_network
+
+console = Console()
+
+# Per-process state of pool workers, filled once by _init_worker
+_worker_state = {}
+
+
+def network_to_nmap_range(network):
+    """Write a CIDR block in nmap octet-range notation, e.g. 10.0.4-7.0-255
+
+    Unlike CIDR, range targets do not get their first address dropped as the
+    network address by the discovery sweep, which is only right for the first
+    shard of a target.
+    """
+    first = int(network.network_address)
+    last = int(network.broadcast_address)
+
+    octets = []
+    for shift in (24, 16, 8, 0):
+        low, high = first >> shift & 255, last >> shift & 255
+        octets.append(str(low) if low == high else f"{low}-{high}")
+    return ".".join(octets)
+
+
+def split_targets(subnet, shard_size=None):
+    """Split comma-separated targets into shards of about shard_size addresses"""
+    shard_size = shard_size or SCAN_BATCH_SIZE
+    shard_prefix = 32 - max(0, shard_size.bit_length() - 1)
+
+    shards = []
+    for target in (target.strip() for target in subnet.split(',')):
+        if not target:
+            continue
+        try:
+            network = ipaddress.IPv4Network(target, strict=False)
+        except ValueError:
+            shards.append(target)  # Hostnames and nmap ranges are kept whole
+            continue
+
+        if network.prefixlen >= shard_prefix:
+            shards.append(target)
+            continue
+
+        for index, shard in enumerate(network.subnets(new_prefix=shard_prefix)):
+            shards.append(str(shard) if index == 0 else network_to_nmap_range(shard))
+    return shards
+
+
+def _init_worker(oui_file, cache):
+    """Load shared read-only state once per worker process"""
+    # Workers stay silent; the parent reports progress per shard
+    sys.stdout = open(os.devnull, 'w')
+    # The compiled OUI index is memory-mapped, so workers share its page cache
+    _worker_state['oui_db'] = load_oui_db(oui_file)
+    _worker_state['cache'] = cache
+
+
+def _scan_shard(shard, ports, workers, engine, timeout):
+    """Run discovery and per-host processing for one shard in a worker"""
+    metrics.reset()
+    devices = process_network(shard, _worker_state['oui_db'], ports, workers, engine, _worker_state['cache'], timeout)
+    # Stage timings travel back with the devices to be merged in the parent
+    return devices, metrics.to_dict()
+
+
+def iter_shard_results(shards, oui_db, ports=None, workers=None, engine=None, cache=None,
+                       delay=None, processes=None, oui_file=None, timeout=None):
+    """Yield each shard's devices in shard order, sequentially or from a process pool"""
+    if not processes or processes <= 1:
+        for number, shard in enumerate(shards, 1):
+            yield process_network(shard, oui_db, ports, workers, engine, cache, timeout)
+            if delay and number < len(shards):
+                time.sleep(delay)
+        return
+
+    # Keep only a small window of shards in flight so finished results
+    # waiting for an earlier shard cannot pile up in memory
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(oui_file, cache)) as pool:
+        pending = deque()
+        shards = iter(shards)
+        for shard in shards:
+            pending.append(pool.submit(_scan_shard, shard, ports, workers, engine, timeout))
+            if len(pending) >= 2 * processes:
+                break
+        while pending:
+            devices, shard_metrics = pending.popleft().result()
+            metrics.merge(shard_metrics)
+            for shard in shards:
+                pending.append(pool.submit(_scan_shard, shard, ports, workers, engine, timeout))
+                break
+            yield devices
+
+
+def scan_sharded(subnet, oui_db, on_shard, ports=None, workers=None, engine=None, cache=None,
+                 shard_size=None, delay=None, processes=None, oui_file=None, timeout=None):
+    """Scan shard by shard, handing each shard's devices to on_shard"""
+    delay = SCAN_DELAY if delay is None else delay
+    shards = split_targets(subnet, shard_size)
+
+    results = iter_shard_results(shards, oui_db, ports, workers, engine, cache, delay, processes, oui_file, timeout)
+    for number, (shard, devices) in enumerate(zip(shards, results), 1):
+        console.print(f":package: [bold green]Shard {number}/{len(shards)}:[/bold green] {shard} ({len(devices)} devices)", style=MAIN_COLOR)
+        if devices:
+            on_shard(devices)
+
+    return len(shards)
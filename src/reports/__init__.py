@@ -2,14 +2,34 @@
 Report generation modules
 """
 
-from .report_generator import save_current_scan, load_prev_scan, save_csv_report, save_json_report, save_exportable_report
-from .scan_comparator import compare_scans
-
-__all__ = [
-    'save_current_scan',
-    'load_prev_scan',
-    'save_csv_report',
-    'save_json_report',
-    'save_exportable_report',
-    'compare_scans'
-] 
\ No newline at end of file
+import importlib
+
+# Public name -> defining submodule, imported on first access
+_EXPORTS = {
+    'build_scan_record': 'report_generator',
+    'save_current_scan': 'report_generator',
+    'load_prev_scan': 'report_generator',
+    'save_exportable_report': 'report_generator',
+    'ScanResultStream': 'report_generator',
+    'ScanExporter': 'export_writer',
+    'get_export_formats': 'export_writer',
+    'export_devices': 'export_writer',
+    'ScanStatistics': 'statistics',
+    'compare_scans': 'scan_comparator',
+    'diff_scans': 'scan_comparator',
+    'print_changes': 'scan_comparator',
+    'HistoryStore': 'history_store',
+    'JsonHistoryStore': 'history_store',
+    'SqliteHistoryStore': 'history_store',
+    'get_history_store': 'history_store',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
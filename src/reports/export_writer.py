@@ -0,0 +1,107 @@
+"""
+Streaming per-scan export of device reports
+"""
+
+import os
+import csv
+import gzip
+import json
+import time
+from rich.console import Console
+
+from ..config.settings import MAIN_COLOR, HISTORY_DIR
+
+console = Console()
+
+EXPORT_FIELDS = ['ip', 'mac', 'manufacturer', 'open_ports', 'device_type', 'score', 'level']
+EXPORT_FORMATS = ('csv', 'jsonl')
+
+
+def get_export_formats(choice):
+    """Map an --export choice to the formats to write"""
+    if choice == 'both':
+        return list(EXPORT_FORMATS)
+    if choice == 'json':
+        return ['jsonl']
+    return [choice] if choice in EXPORT_FORMATS else []
+
+
+def export_record(device):
+    """Get the exported fields of a device"""
+    return {
+        'ip': device['ip'],
+        'mac': device['mac'],
+        'manufacturer': device['manufacturer'],
+        'open_ports': [int(port) for port in device['open ports']],
+        'device_type': device['device type'],
+        'score': device['score'],
+        'level': device['level'],
+    }
+
+
+class ScanExporter:
+    """One export file per scan, written sequentially as devices arrive
+
+    Devices go to a temporary file that is renamed into place when the
+    export completes, so readers never see a partial report.
+    """
+
+    def __init__(self, export_format, subnet, directory=None, compress=False, timestamp=None):
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"unsupported export format: {export_format}")
+
+        directory = directory or HISTORY_DIR
+        timestamp = timestamp or int(time.time())
+        suffix = '.gz' if compress else ''
+        self.format = export_format
+        self.compress = compress
+        self.filename = f"{directory}/scan_{timestamp}_{subnet.replace('/', '-').replace(',', '_')}.{export_format}{suffix}"
+        self.count = 0
+        self._tmp_filename = f"{self.filename}.part"
+        self._file = None
+        self._csv_writer = None
+
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        if self.compress:
+            self._file = gzip.open(self._tmp_filename, 'wt', encoding='utf-8', newline='')
+        else:
+            self._file = open(self._tmp_filename, 'w', encoding='utf-8', newline='')
+
+        if self.format == 'csv':
+            self._csv_writer = csv.writer(self._file)
+            self._csv_writer.writerow(EXPORT_FIELDS)
+        return self
+
+    def write(self, devices):
+        """Append devices to the export"""
+        for device in devices:
+            record = export_record(device)
+            if self._csv_writer:
+                record['open_ports'] = ', '.join(map(str, record['open_ports'])) or 'None'
+                record['device_type'] = ', '.join(record['device_type'])
+                self._csv_writer.writerow([record[field] for field in EXPORT_FIELDS])
+            else:
+                self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.close()
+        if exc_type is not None:
+            os.remove(self._tmp_filename)
+            return False
+
+        os.replace(self._tmp_filename, self.filename)
+        console.print(f":page_facing_up: [bold green]{self.count} devices exported to[/bold green] [underline]{self.filename}[/underline]", style=MAIN_COLOR)
+        return False
+
+
+def export_devices(devices, subnet, export_format, directory=None, compress=False, timestamp=None):
+    """Write a whole device list to one export file"""
+    try:
+        with ScanExporter(export_format, subnet, directory, compress, timestamp) as exporter:
+            exporter.write(devices)
+        return exporter.filename
+    except Exception as e:
+        console.print(f":x: [bold red]Error exporting {export_format.upper()}:[/bold red] {e}", style=MAIN_COLOR)
+        return None
@@ -0,0 +1,241 @@
+"""
+Pluggable scan history storage backends
+"""
+
+import json
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from contextlib import closing
+
+from ..config.settings import HISTORY_DIR, HISTORY_DB_PATH, HISTORY_BACKEND
+
+# Device keys stored in their own columns or tables; anything else goes to `extra`
+DEVICE_COLUMNS = ('ip', 'mac', 'manufacturer', 'open ports', 'device type', 'score', 'level', 'scanned_at')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    subnet TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    ports TEXT,
+    metrics TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_scans_subnet_created ON scans (subnet, created_at);
+
+CREATE TABLE IF NOT EXISTS devices (
+    id INTEGER PRIMARY KEY,
+    scan_id INTEGER NOT NULL REFERENCES scans (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    ip TEXT,
+    mac TEXT,
+    manufacturer TEXT,
+    device_type TEXT,
+    score INTEGER,
+    level TEXT,
+    scanned_at INTEGER,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_devices_scan ON devices (scan_id, position);
+CREATE INDEX IF NOT EXISTS idx_devices_ip ON devices (ip);
+CREATE INDEX IF NOT EXISTS idx_devices_mac ON devices (mac);
+
+CREATE TABLE IF NOT EXISTS ports (
+    device_id INTEGER NOT NULL REFERENCES devices (id) ON DELETE CASCADE,
+    port INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ports_device ON ports (device_id);
+"""
+
+
+class HistoryStore(ABC):
+    """Interface for scan history backends"""
+
+    location = None
+
+    @abstractmethod
+    def save_scan(self, data):
+        """Persist one scan ({'timestamp', 'subnet', 'devices', ...})"""
+
+    @abstractmethod
+    def load_latest(self, subnet):
+        """Get the most recent scan for a subnet, or None"""
+
+
+class JsonHistoryStore(HistoryStore):
+    """One pretty-printed JSON snapshot per scan in a directory"""
+
+    def __init__(self, history_dir=None):
+        self.history_dir = history_dir or HISTORY_DIR
+        self.location = self.history_dir
+
+    def save_scan(self, data):
+        filename = f"{self.history_dir}/scan_{int(time.time())}_{data['subnet'].replace('/', '-')}.json"
+        os.makedirs(self.history_dir, exist_ok=True)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False, default=dict)
+        return filename
+
+    def list_snapshots(self, subnet=None):
+        """Get snapshot paths, optionally only those of one subnet"""
+        if not os.path.exists(self.history_dir):
+            return []
+
+        return [
+            os.path.join(self.history_dir, file) for file in os.listdir(self.history_dir)
+            if file.startswith('scan_') and file.endswith('.json')
+            and (subnet is None or subnet.replace('/', '-') in file)
+        ]
+
+    def load_latest(self, subnet):
+        scans = self.list_snapshots(subnet)
+        if not scans:
+            return None
+
+        latest_file = max(scans, key=os.path.getctime)
+        with open(latest_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+class SqliteHistoryStore(HistoryStore):
+    """Scans, devices and ports tables indexed by subnet, time, IP and MAC
+
+    JSON snapshots found in the legacy history directory are imported once,
+    when the database is created.
+    """
+
+    def __init__(self, path=None, legacy_dir=None):
+        self.path = path or HISTORY_DB_PATH
+        self.location = self.path
+        self.legacy_store = JsonHistoryStore(legacy_dir)
+        self._initialized = False
+
+    def _connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        created = not os.path.exists(self.path)
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA foreign_keys = ON")
+        if not self._initialized:
+            conn.executescript(SCHEMA)
+            # Databases created before scan metrics were recorded
+            if 'metrics' not in {row[1] for row in conn.execute("PRAGMA table_info(scans)")}:
+                conn.execute("ALTER TABLE scans ADD COLUMN metrics TEXT")
+            if created:
+                with conn:
+                    self._import_legacy(conn)
+            self._initialized = True
+        return conn
+
+    def _import_legacy(self, conn):
+        """Copy the JSON snapshots into a new database, oldest first"""
+        for filename in sorted(self.legacy_store.list_snapshots(), key=os.path.getctime):
+            try:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self._insert_scan(conn, data, int(os.path.getctime(filename)))
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                # Not a scan snapshot, or a damaged one
+                continue
+
+    def _insert_scan(self, conn, data, created_at):
+        scan_id = conn.execute(
+            "INSERT INTO scans (subnet, created_at, timestamp, ports, metrics) VALUES (?, ?, ?, ?, ?)",
+            (data['subnet'], created_at, data['timestamp'],
+             json.dumps(data['ports']) if data.get('ports') else None,
+             json.dumps(data['metrics']) if data.get('metrics') else None)
+        ).lastrowid
+
+        for position, device in enumerate(data['devices']):
+            extra = {k: v for k, v in device.items() if k not in DEVICE_COLUMNS}
+            device_id = conn.execute(
+                "INSERT INTO devices (scan_id, position, ip, mac, manufacturer, device_type, score, level, scanned_at, extra)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (scan_id, position, device.get('ip'), device.get('mac'), device.get('manufacturer'),
+                 json.dumps(device.get('device type')), device.get('score'), device.get('level'),
+                 device.get('scanned_at'), json.dumps(extra) if extra else None)
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO ports (device_id, port) VALUES (?, ?)",
+                [(device_id, int(port)) for port in device.get('open ports', [])]
+            )
+
+    def save_scan(self, data):
+        with closing(self._connect()) as conn, conn:
+            self._insert_scan(conn, data, int(time.time()))
+
+        return self.path
+
+    def load_latest(self, subnet):
+        # Without a database only legacy snapshots could answer; importing
+        # them creates the database, so this check runs until the first save
+        if not os.path.exists(self.path) and not self.legacy_store.list_snapshots():
+            return None
+
+        with closing(self._connect()) as conn:
+            scan = conn.execute(
+                "SELECT id, subnet, timestamp, ports, metrics FROM scans WHERE subnet = ?"
+                " ORDER BY created_at DESC, id DESC LIMIT 1",
+                (subnet,)
+            ).fetchone()
+            if scan is None:
+                return None
+
+            scan_id, subnet, timestamp, ports, scan_metrics = scan
+            rows = conn.execute(
+                "SELECT id, ip, mac, manufacturer, device_type, score, level, scanned_at, extra"
+                " FROM devices WHERE scan_id = ? ORDER BY position",
+                (scan_id,)
+            ).fetchall()
+
+            open_ports = {}
+            for device_id, port in conn.execute(
+                "SELECT ports.device_id, ports.port FROM ports JOIN devices ON devices.id = ports.device_id"
+                " WHERE devices.scan_id = ? ORDER BY ports.rowid",
+                (scan_id,)
+            ):
+                open_ports.setdefault(device_id, []).append(str(port))
+
+        devices = []
+        for device_id, ip, mac, manufacturer, device_type, score, level, scanned_at, extra in rows:
+            device = {
+                "ip": ip,
+                "mac": mac,
+                "manufacturer": manufacturer,
+                "open ports": open_ports.get(device_id, []),
+                "device type": json.loads(device_type) if device_type else [],
+                "score": score,
+                "level": level,
+            }
+            if scanned_at is not None:
+                device['scanned_at'] = scanned_at
+            if extra:
+                device.update(json.loads(extra))
+            devices.append(device)
+
+        data = {'timestamp': timestamp, 'subnet': subnet, 'devices': devices}
+        if ports:
+            data['ports'] = json.loads(ports)
+        if scan_metrics:
+            data['metrics'] = json.loads(scan_metrics)
+        return data
+
+
+HISTORY_BACKENDS = {
+    'sqlite': SqliteHistoryStore,
+    'json': JsonHistoryStore,
+}
+
+_stores = {}
+
+
+def get_history_store(backend=None):
+    """Get the (shared) history store for a backend name"""
+    backend = backend or HISTORY_BACKEND
+    if backend not in _stores:
+        _stores[backend] = HISTORY_BACKENDS[backend]()
+    return _stores[backend]
@@ -5,66 +5,170 @@ Scan comparison and change detection
 from rich.console import Console
 
 from ..config.settings import MAIN_COLOR
+from ..core.device import get_open_ports
 
 console = Console()
 
+CHANGE_TYPES = ('new', 'vanished', 'moved', 'ports_opened', 'ports_closed', 'mac_changed', 'risk_changed')
 
-def compare_scans(current_devices, previous_data):
-    """Compare current scan with previous scan"""
-    console.print("\n:arrows_counterclockwise: [bold cyan]Analyzing network changes...[/bold cyan]", style=MAIN_COLOR)
-    
-    if not previous_data or 'devices' not in previous_data:
-        console.print(":information_source: [yellow]No data to compare[/yellow]", style=MAIN_COLOR)
-        return
-    
-    previous_devices = {dev['ip']: dev for dev in previous_data.get('devices', [])}
-    changes_found = False
-
-    new_devices = []
-    vanished_devices = []
-    current_ips = set()
-
-    # Check for new devices and risk changes
-    for device in current_devices:
-        ip = device['ip']
-        current_ips.add(ip)
-
-        if ip not in previous_devices:
-            new_devices.append(device)
-        else:
-            prev_score = previous_devices[ip].get('score', 0)
-            curr_score = device.get('score', 0)
-            if curr_score > prev_score:
-                console.print(
-                    f":warning: [bold yellow]Risk increased for {ip}:[/bold yellow] {previous_devices[ip]['level']} → {device['level']} ({prev_score} → {curr_score})",
-                    style=MAIN_COLOR
-                )
-                changes_found = True
-    
-    # Check for vanished devices
-    for ip in previous_devices:
-        if ip not in current_ips:
-            vanished_devices.append(previous_devices[ip])
-    
-    # Report new devices
-    if new_devices:
-        console.print(f":sparkles: [bold green]New devices:[/bold green]", style=MAIN_COLOR)
-        for dev in new_devices:
+
+def has_valid_mac(device):
+    """Check whether a device has a resolved MAC address"""
+    return device.get('mac') not in (None, '', 'Not found')
+
+
+def device_fingerprint(device):
+    """Content fingerprint covering every field the diff reports on"""
+    return hash((
+        device.get('ip'),
+        device.get('mac'),
+        tuple(sorted(get_open_ports(device))),
+        device.get('score', 0),
+    ))
+
+
+def diff_scans(current_devices, previous_devices):
+    """Diff two device lists, joining on MAC first and on IP as a fallback
+
+    Returns a dict with one list per change type in CHANGE_TYPES.
+    """
+    changes = {change_type: [] for change_type in CHANGE_TYPES}
+
+    # Build side: previous devices by MAC and by IP, plus their fingerprints
+    prev_by_mac = {}
+    prev_by_ip = {}
+    prev_fingerprints = [device_fingerprint(device) for device in previous_devices]
+    for index, device in enumerate(previous_devices):
+        if has_valid_mac(device):
+            prev_by_mac.setdefault(device['mac'], []).append(index)
+        prev_by_ip.setdefault(device.get('ip'), []).append(index)
+
+    matched = {}
+    matched_prev = set()
+
+    # Probe by MAC, preferring the previous entry that also kept its IP
+    for index, device in enumerate(current_devices):
+        if not has_valid_mac(device):
+            continue
+        candidates = [i for i in prev_by_mac.get(device['mac'], []) if i not in matched_prev]
+        if candidates:
+            same_ip = [i for i in candidates if previous_devices[i].get('ip') == device.get('ip')]
+            prev_index = (same_ip or candidates)[0]
+            matched[index] = prev_index
+            matched_prev.add(prev_index)
+
+    # Fall back to IP for whatever is still unmatched
+    for index, device in enumerate(current_devices):
+        if index in matched:
+            continue
+        candidates = [i for i in prev_by_ip.get(device.get('ip'), []) if i not in matched_prev]
+        if candidates:
+            matched[index] = candidates[0]
+            matched_prev.add(candidates[0])
+
+    for index, device in enumerate(current_devices):
+        if index not in matched:
+            changes['new'].append(device)
+            continue
+
+        previous = previous_devices[matched[index]]
+        if device_fingerprint(device) == prev_fingerprints[matched[index]]:
+            continue
+
+        ip = device.get('ip')
+        if previous.get('ip') != ip:
+            changes['moved'].append({'mac': device.get('mac'), 'from_ip': previous.get('ip'), 'to_ip': ip})
+
+        if previous.get('mac') != device.get('mac'):
+            changes['mac_changed'].append({'ip': ip, 'from_mac': previous.get('mac'), 'to_mac': device.get('mac')})
+
+        current_ports = set(get_open_ports(device))
+        previous_ports = set(get_open_ports(previous))
+        if current_ports - previous_ports:
+            changes['ports_opened'].append({'ip': ip, 'mac': device.get('mac'), 'ports': sorted(current_ports - previous_ports)})
+        if previous_ports - current_ports:
+            changes['ports_closed'].append({'ip': ip, 'mac': device.get('mac'), 'ports': sorted(previous_ports - current_ports)})
+
+        if previous.get('score', 0) != device.get('score', 0):
+            changes['risk_changed'].append({
+                'ip': ip,
+                'from_score': previous.get('score', 0),
+                'to_score': device.get('score', 0),
+                'from_level': previous.get('level'),
+                'to_level': device.get('level'),
+            })
+
+    changes['vanished'] = [device for index, device in enumerate(previous_devices) if index not in matched_prev]
+    return changes
+
+
+def print_changes(changes):
+    """Print a change set to the console"""
+    if changes['new']:
+        console.print(":sparkles: [bold green]New devices:[/bold green]", style=MAIN_COLOR)
+        for dev in changes['new']:
             console.print(
                 f"   IP: {dev['ip']} | Manufacturer: {dev['manufacturer']} | Ports: {dev['open ports']}",
                 style=MAIN_COLOR
             )
-        changes_found = True
-    
-    # Report vanished devices
-    if vanished_devices:
+
+    if changes['vanished']:
         console.print(":wastebasket: [bold yellow]Vanished devices:[/bold yellow]", style=MAIN_COLOR)
-        for dev in vanished_devices:
+        for dev in changes['vanished']:
             console.print(
                 f"   IP: {dev['ip']} | Manufacturer: {dev['manufacturer']}",
                 style=MAIN_COLOR
             )
-        changes_found = True
+
+    for move in changes['moved']:
+        console.print(
+            f":arrow_right: [bold cyan]Device {move['mac']} moved:[/bold cyan] {move['from_ip']} → {move['to_ip']}",
+            style=MAIN_COLOR
+        )
+
+    for change in changes['mac_changed']:
+        console.print(
+            f":warning: [bold yellow]MAC changed for {change['ip']}:[/bold yellow] {change['from_mac']} → {change['to_mac']}",
+            style=MAIN_COLOR
+        )
+
+    for change in changes['ports_opened']:
+        console.print(
+            f":unlock: [bold yellow]Ports opened on {change['ip']}:[/bold yellow] {', '.join(map(str, change['ports']))}",
+            style=MAIN_COLOR
+        )
+
+    for change in changes['ports_closed']:
+        console.print(
+            f":lock: [bold green]Ports closed on {change['ip']}:[/bold green] {', '.join(map(str, change['ports']))}",
+            style=MAIN_COLOR
+        )
+
+    for change in changes['risk_changed']:
+        direction = "increased" if change['to_score'] > change['from_score'] else "decreased"
+        console.print(
+            f":warning: [bold yellow]Risk {direction} for {change['ip']}:[/bold yellow] {change['from_level']} → {change['to_level']} ({change['from_score']} → {change['to_score']})",
+            style=MAIN_COLOR
+        )
+
+
+def has_changes(changes):
+    """Check whether a change set contains any change"""
+    return any(changes[change_type] for change_type in CHANGE_TYPES)
+
+
+def compare_scans(current_devices, previous_data):
+    """Compare current scan with previous scan and return the change set"""
+    console.print("\n:arrows_counterclockwise: [bold cyan]Analyzing network changes...[/bold cyan]", style=MAIN_COLOR)
     
-    if not changes_found:
-        console.print(":white_check_mark: [bold green]No network changes detected[/bold green]", style=MAIN_COLOR) 
\ No newline at end of file
+    if not previous_data or 'devices' not in previous_data:
+        console.print(":information_source: [yellow]No data to compare[/yellow]", style=MAIN_COLOR)
+        return None
+    
+    changes = diff_scans(current_devices, previous_data.get('devices', []))
+    print_changes(changes)
+
+    if not has_changes(changes):
+        console.print(":white_check_mark: [bold green]No network changes detected[/bold green]", style=MAIN_COLOR)
+
+    return changes
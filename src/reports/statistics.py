@@ -0,0 +1,30 @@
+"""
+Running scan statistics
+"""
+
+
+class ScanStatistics:
+    """Aggregates for the statistics table, updated one device at a time"""
+
+    def __init__(self):
+        self.total = 0
+        self.levels = {}
+        self.manufacturers = {}
+
+    def add(self, device):
+        """Account for one device"""
+        self.total += 1
+        level = device.get('level')
+        self.levels[level] = self.levels.get(level, 0) + 1
+        mfr = device.get('manufacturer', 'Unknown')
+        self.manufacturers[mfr] = self.manufacturers.get(mfr, 0) + 1
+
+    def add_all(self, devices):
+        """Account for many devices"""
+        for device in devices:
+            self.add(device)
+        return self
+
+    def count(self, level):
+        """Number of devices with a risk level"""
+        return self.levels.get(level, 0)
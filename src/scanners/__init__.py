@@ -2,17 +2,40 @@
 Network scanning modules
 """
 
-from .network_scanner import find_subnet, scan_network
-from .port_scanner import check_ports, get_http_headers
-from .mac_scanner import get_mac_address, get_oui, load_oui_db, get_manufacturer
+import importlib
 
-__all__ = [
-    'find_subnet',
-    'scan_network',
-    'check_ports',
-    'get_http_headers',
-    'get_mac_address',
-    'get_oui',
-    'load_oui_db',
-    'get_manufacturer'
-] 
\ No newline at end of file
+# Public name -> defining submodule, imported on first access so that
+# using one part of the package does not load the dependencies of the rest
+_EXPORTS = {
+    'find_subnet': 'network_scanner',
+    'find_subnets': 'network_scanner',
+    'iter_active_hosts': 'network_scanner',
+    'scan_network': 'network_scanner',
+    'check_ports': 'port_scanner',
+    'check_ports_batch': 'port_scanner',
+    'parse_nmap_xml': 'port_scanner',
+    'get_http_headers': 'port_scanner',
+    'fetch_headers': 'http_scanner',
+    'fingerprint_hosts': 'http_scanner',
+    'connect_scan': 'connect_scanner',
+    'connect_scan_batch': 'connect_scanner',
+    'get_mac_address': 'mac_scanner',
+    'get_mac_addresses': 'mac_scanner',
+    'read_neighbor_table': 'mac_scanner',
+    'get_oui': 'mac_scanner',
+    'load_oui_db': 'mac_scanner',
+    'get_manufacturer': 'mac_scanner',
+    'OUIIndex': 'oui_index',
+    'build_oui_index': 'oui_index',
+    'load_oui_index': 'oui_index',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,110 @@
+"""
+Pure-Python asyncio TCP connect port scanning
+"""
+
+import socket
+import asyncio
+import threading
+from rich.console import Console
+
+from ..config.settings import MAIN_COLOR, SCAN_PORTS, CONNECTION_TIMEOUT, ASYNC_SCAN_CONCURRENCY
+
+console = Console()
+
+# File descriptors kept free for stdin/stdout, log files and HTTP probes
+FD_RESERVE = 64
+
+# Batches scanned from several threads run one at a time, each with the full
+# descriptor budget, instead of together overrunning RLIMIT_NOFILE
+_scan_lock = threading.Lock()
+
+
+def get_max_concurrency(requested=None):
+    """Get connection concurrency bounded by the process file descriptor limit"""
+    limit = requested or ASYNC_SCAN_CONCURRENCY
+
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft != resource.RLIM_INFINITY:
+            limit = min(limit, soft - FD_RESERVE)
+    except (ImportError, ValueError, OSError):
+        pass
+
+    return max(1, limit)
+
+
+async def probe_port(ip, port, timeout):
+    """Try a TCP connect to a single port"""
+    # A bare socket avoids stream setup, which for thousands of connects at
+    # once would keep the loop busy past short timeouts
+    sock = socket.socket(socket.AF_INET6 if ':' in ip else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setblocking(False)
+    try:
+        await asyncio.wait_for(asyncio.get_running_loop().sock_connect(sock, (ip, port)), timeout)
+        return True
+    except asyncio.TimeoutError:
+        # The kernel may have completed the handshake while the loop was busy
+        return _is_connected(sock)
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def _is_connected(sock):
+    """Check whether a non-blocking connect has completed"""
+    try:
+        sock.getpeername()
+        return True
+    except OSError:
+        return False
+
+
+async def _scan_targets(targets, timeout, concurrency):
+    """Probe (ip, port) targets with at most `concurrency` connects in flight"""
+    open_targets = []
+    targets = iter(targets)
+
+    # A fixed set of workers draining one shared iterator keeps both the
+    # number of open sockets and the number of pending coroutines bounded
+    async def worker():
+        for ip, port in targets:
+            if await probe_port(ip, port, timeout):
+                open_targets.append((ip, port))
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return open_targets
+
+
+def connect_scan_batch(ips, ports=None, timeout=None, concurrency=None):
+    """Scan specific ports on many hosts with asyncio TCP connects
+
+    timeout is the per-connection timeout in seconds, CONNECTION_TIMEOUT if unset.
+    """
+    port_map = {ip: [] for ip in ips}
+
+    if ports is None:
+        ports = SCAN_PORTS
+    if timeout is None:
+        timeout = CONNECTION_TIMEOUT
+
+    targets = ((ip, port) for ip in ips for port in ports)
+    concurrency = min(get_max_concurrency(concurrency), max(1, len(ips) * len(ports)))
+
+    try:
+        with _scan_lock:
+            open_targets = asyncio.run(_scan_targets(targets, timeout, concurrency))
+    except Exception as e:
+        console.print(f":x: [bold red]Error scanning ports for {len(ips)} hosts:[/bold red] {e}", style=MAIN_COLOR)
+        return port_map
+
+    for ip, port in sorted(open_targets, key=lambda target: target[1]):
+        port_map[ip].append(str(port))
+
+    return port_map
+
+
+def connect_scan(ip, ports=None, timeout=None):
+    """Scan specific ports on a host with asyncio TCP connects"""
+    return connect_scan_batch([ip], ports, timeout)[ip]
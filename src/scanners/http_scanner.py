@@ -0,0 +1,99 @@
+"""
+Concurrent HTTP fingerprinting over a pooled session
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ..config.settings import HTTP_PORTS, HTTP_TIMEOUT, HTTP_MAX_CONCURRENCY
+
+_session = None
+_session_lock = threading.Lock()
+
+# Caps in-flight requests across every fingerprinting batch of a scan
+_request_slots = threading.BoundedSemaphore(HTTP_MAX_CONCURRENCY)
+
+# One pool of request threads shared by the concurrently processed batches
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _reset_executor():
+    # Threads do not survive fork: a forked shard worker starts its own pool
+    global _executor
+    _executor = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_executor)
+
+
+def get_http_session():
+    """Get the shared requests session with a bounded connection pool"""
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            import requests
+            import urllib3
+
+            # Embedded web UIs almost always use self-signed certificates
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=HTTP_MAX_CONCURRENCY,
+                pool_maxsize=HTTP_MAX_CONCURRENCY,
+                max_retries=0
+            )
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+
+    return _session
+
+
+def fetch_headers(ip, port=80, scheme='http', timeout=None):
+    """Fetch response headers from a web port without downloading the body"""
+    try:
+        with _request_slots, get_http_session().get(
+            f"{scheme}://{ip}:{port}/",
+            timeout=timeout or HTTP_TIMEOUT,
+            stream=True,
+            verify=False,
+            allow_redirects=False
+        ) as response:
+            return response.headers
+    except Exception:
+        return {}
+
+
+def get_http_executor():
+    """Get the shared thread pool running fingerprint requests"""
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=HTTP_MAX_CONCURRENCY, thread_name_prefix="http-fingerprint")
+
+    return _executor
+
+
+def fingerprint_hosts(port_map):
+    """Fetch headers from every open web port of every host concurrently"""
+    results = {ip: [] for ip in port_map}
+    targets = [
+        (ip, int(port)) for ip, ports in port_map.items()
+        for port in ports if int(port) in HTTP_PORTS
+    ]
+
+    if not targets:
+        return results
+
+    responses = get_http_executor().map(lambda target: fetch_headers(target[0], target[1], HTTP_PORTS[target[1]]), targets)
+    for (ip, _), headers in zip(targets, responses):
+        if headers:
+            results[ip].append(headers)
+
+    return results
@@ -4,9 +4,12 @@ MAC address detection and OUI processing
 
 import subprocess
 import os
+import re
 from rich.console import Console
 
-from ..config.settings import MAIN_COLOR, OUI_DB_PATH
+from ..config.settings import MAIN_COLOR, OUI_DB_PATH, MAM_DB_PATH, OUI36_DB_PATH, NEIGHBOR_TABLE_PATH
+from .oui_index import OUIIndex, MAX_PREFIX_NIBBLES, load_oui_index, parse_oui_file
+from ..utils.metrics import metrics
 
 console = Console()
 
@@ -14,6 +17,7 @@ console = Console()
 def get_mac_address(ip):
     """Get MAC address for an IP using ARP"""
     try:
+        metrics.count('subprocesses')
         result = subprocess.run(["arp", ip], capture_output=True, text=True)
         for line in result.stdout.splitlines():
             if 'at' in line:
@@ -26,36 +30,95 @@ def get_mac_address(ip):
         return None
 
 
+def normalize_mac(mac):
+    """Normalize a MAC address to upper-case, zero-padded colon form"""
+    return ":".join(part.zfill(2) for part in mac.replace("-", ":").split(":")).upper()
+
+
+def read_neighbor_table(filename=None):
+    """Read the kernel neighbor table into an ip -> MAC map"""
+    filename = filename or NEIGHBOR_TABLE_PATH
+    neighbors = {}
+
+    with open(filename, 'r') as f:
+        next(f, None)  # Skip header line
+        for line in f:
+            parts = line.split()
+            if len(parts) < 4:
+                continue
+            ip, flags, mac = parts[0], parts[2], parts[3]
+            # Flags 0x0 marks an incomplete entry with no resolved address
+            if flags == '0x0' or mac == '00:00:00:00:00:00':
+                continue
+            neighbors[ip] = normalize_mac(mac)
+
+    return neighbors
+
+
+def read_arp_cache():
+    """Read the whole ARP cache with a single `arp -an` call"""
+    neighbors = {}
+    metrics.count('subprocesses')
+    result = subprocess.run(["arp", "-an"], capture_output=True, text=True)
+
+    # "? (192.168.1.1) at aa:bb:cc:dd:ee:ff on en0 ..." on Linux and BSD/macOS
+    for match in re.finditer(r'\(([\d.]+)\) at ([0-9A-Fa-f:]+)', result.stdout):
+        neighbors[match.group(1)] = normalize_mac(match.group(2))
+
+    return neighbors
+
+
+def get_mac_addresses(ips):
+    """Get MAC addresses for many IPs from one neighbor table read"""
+    try:
+        if os.path.exists(NEIGHBOR_TABLE_PATH):
+            neighbors = read_neighbor_table()
+        else:
+            neighbors = read_arp_cache()
+    except Exception as e:
+        console.print(f":x: [bold red]Error reading neighbor table:[/bold red] {e}", style=MAIN_COLOR)
+        return {}
+
+    return {ip: neighbors[ip] for ip in ips if ip in neighbors}
+
+
 def get_oui(mac):
-    """Extract OUI from MAC address"""
+    """Extract the longest possible registry prefix (MA-S, 36 bits) from MAC address"""
     if not mac:
         return None
-    return mac.replace(":", "").replace("-", "").upper()[:6]
+    return mac.replace(":", "").replace("-", "").upper()[:MAX_PREFIX_NIBBLES]
 
 
 def load_oui_db(filename=None):
-    """Load OUI database from file"""
-    oui_dict = {}
+    """Load MA-L, MA-M and MA-S registries, using the compiled index when possible"""
+    oui_db = {}
     filename = filename or OUI_DB_PATH
     
     try:
         if os.path.exists(filename):
-            with open(filename, 'r') as f:
-                for line in f:
-                    parts = line.strip().split()
-                    if '(base 16)' in line and len(parts) >= 4:
-                        oui = parts[0].replace('-', '').upper()
-                        manufacturer = ' '.join(parts[3:])
-                        oui_dict[oui] = manufacturer
-            console.print(f":bookmark_tabs: [bold green]{len(oui_dict)} OUI records loaded[/bold green]", style=MAIN_COLOR)
+            sources = [filename] + [path for path in (MAM_DB_PATH, OUI36_DB_PATH) if os.path.exists(path)]
+            try:
+                oui_db = load_oui_index(sources)
+            except OSError:
+                # Index directory not writable: parse the registries directly
+                for source in sources:
+                    oui_db.update(parse_oui_file(source))
+            console.print(f":bookmark_tabs: [bold green]{len(oui_db)} OUI records loaded[/bold green]", style=MAIN_COLOR)
         else:
             console.print(f":x: [bold red]File not found:[/bold red] {filename}", style=MAIN_COLOR)
     except Exception as e:
         console.print(f":x: [bold red]Error loading OUI database:[/bold red] {e}", style=MAIN_COLOR)
     
-    return oui_dict
+    return oui_db
 
 
 def get_manufacturer(oui, oui_db):
-    """Get manufacturer name from OUI"""
-    return oui_db.get(oui, "Unknown manufacturer") 
\ No newline at end of file
+    """Get manufacturer name from the longest matching OUI prefix"""
+    if isinstance(oui_db, OUIIndex):
+        return oui_db.get(oui, "Unknown manufacturer")
+
+    # Plain dict fallback: try MA-S, MA-M then MA-L prefix lengths
+    for length in (9, 7, 6):
+        if oui and oui[:length] in oui_db:
+            return oui_db[oui[:length]]
+    return "Unknown manufacturer"
@@ -2,31 +2,106 @@
 Network discovery and subnet detection
 """
 
+import ipaddress
 import subprocess
 from rich.console import Console
 
 from ..config.settings import MAIN_COLOR, DEFAULT_SUBNET, SCAN_TIMEOUT, MIN_HOSTGROUP
+from ..utils.metrics import metrics
 
 console = Console()
 
+ROUTE_TABLE_PATH = "/proc/net/route"
 
-def find_subnet():
-    """Detect local subnet automatically"""
+
+def get_default_interface():
+    """Get the interface carrying the IPv4 default route from the kernel route table"""
     try:
-        result = subprocess.run(['ifconfig'], capture_output=True, text=True)
-        for line in result.stdout.splitlines():
-            if 'inet' in line and '127.0.0.1' not in line and 'inet6' not in line:
+        with open(ROUTE_TABLE_PATH, 'r') as f:
+            next(f, None)  # Skip header line
+            for line in f:
                 parts = line.split()
-                for item in parts:
-                    if '.' in item and len(item.split('.')) == 4:
-                        try:
-                            ip_parts = item.split('.')
-                            if len(ip_parts) == 4 and all(0 <= int(x) < 256 for x in ip_parts):
-                                network = ".".join(ip_parts[:3]) + ".0/24"
-                                console.print(f":mag: [bold green]Subnet detected:[/bold green] {network}", style=MAIN_COLOR)
-                                return network
-                        except ValueError:
-                            continue
+                if len(parts) >= 2 and parts[1] == '00000000':
+                    return parts[0]
+    except OSError:
+        pass
+    return None
+
+
+def _make_network(address, netmask):
+    """Build a scannable network from an interface address and netmask"""
+    network = ipaddress.IPv4Network(f"{address}/{netmask}", strict=False)
+    if network.is_loopback or network.is_link_local or network.prefixlen == 32:
+        return None
+    return network
+
+
+def _interfaces_from_psutil():
+    """Enumerate (interface, network) pairs through psutil"""
+    import socket
+    import psutil
+
+    interfaces = []
+    for name, addresses in psutil.net_if_addrs().items():
+        for address in addresses:
+            if address.family == socket.AF_INET and address.netmask:
+                network = _make_network(address.address, address.netmask)
+                if network:
+                    interfaces.append((name, network))
+    return interfaces
+
+
+def _interfaces_from_ifconfig():
+    """Enumerate (interface, network) pairs by parsing ifconfig output"""
+    interfaces = []
+    metrics.count('subprocesses')
+    result = subprocess.run(['ifconfig'], capture_output=True, text=True)
+
+    name = None
+    for line in result.stdout.splitlines():
+        if line and not line[0].isspace():
+            name = line.split(':')[0].split()[0]
+        parts = line.split()
+        if 'inet' not in parts or 'netmask' not in parts:
+            continue
+        address = parts[parts.index('inet') + 1].replace('addr:', '')
+        netmask = parts[parts.index('netmask') + 1]
+        if netmask.startswith('0x'):  # BSD/macOS print the mask in hex
+            netmask = str(ipaddress.IPv4Address(int(netmask, 16)))
+        try:
+            network = _make_network(address, netmask)
+        except ValueError:
+            continue
+        if network:
+            interfaces.append((name, network))
+    return interfaces
+
+
+def find_subnets():
+    """Detect every attached IPv4 network, default-route interface first"""
+    try:
+        interfaces = _interfaces_from_psutil()
+    except ImportError:
+        interfaces = _interfaces_from_ifconfig()
+
+    default_interface = get_default_interface()
+    interfaces.sort(key=lambda item: item[0] != default_interface)
+
+    subnets = []
+    for _, network in interfaces:
+        if str(network) not in subnets:
+            subnets.append(str(network))
+    return subnets
+
+
+def find_subnet(all_subnets=False):
+    """Detect local subnet automatically, optionally joining every attached network"""
+    try:
+        subnets = find_subnets()
+        if subnets:
+            network = ",".join(subnets) if all_subnets else subnets[0]
+            console.print(f":mag: [bold green]Subnet detected:[/bold green] {network}", style=MAIN_COLOR)
+            return network
     except Exception as e:
         console.print(f":x: [bold red]Error detecting subnet:[/bold red] {e}", style=MAIN_COLOR)
     
@@ -34,27 +109,40 @@ def find_subnet():
     return DEFAULT_SUBNET
 
 
+def iter_active_hosts(subnet):
+    """Yield active hosts as nmap reports them, accepting comma-separated subnets"""
+    targets = [target.strip() for target in subnet.split(',') if target.strip()]
+    network_addresses = {target.split('/')[0] for target in targets}
+
+    metrics.count('subprocesses')
+    process = subprocess.Popen([
+        "nmap", "-sn", 
+        "--host-timeout", f"{SCAN_TIMEOUT}ms", 
+        "--min-hostgroup", str(MIN_HOSTGROUP), 
+        *targets
+    ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1)
+
+    try:
+        for line in process.stdout:
+            if "Nmap scan report" in line:
+                ip = line.split()[-1].strip('()')
+                if ip not in network_addresses:  # Exclude network addresses
+                    yield ip
+    finally:
+        # Stop the sweep if the consumer gives up early
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+
+
 def scan_network(subnet):
     """Scan network for active hosts"""
-    found_ips = []
-    
     try:
-        command = subprocess.run([
-            "nmap", "-sn", 
-            "--host-timeout", f"{SCAN_TIMEOUT}ms", 
-            "--min-hostgroup", str(MIN_HOSTGROUP), 
-            subnet
-        ], capture_output=True, text=True)
-        
-        for line in command.stdout.splitlines():
-            if "Nmap scan report" in line:
-                ip = line.split()[-1]
-                if ip != subnet.split('/')[0]:  # Exclude network address
-                    found_ips.append(ip)
-        
+        found_ips = list(iter_active_hosts(subnet))
         console.print(f":mag: [bold green]{len(found_ips)} active devices found[/bold green]", style=MAIN_COLOR)
         return found_ips
         
     except Exception as e:
         console.print(f":x: [bold red]Error scanning network:[/bold red] {e}", style=MAIN_COLOR)
-        return [] 
\ No newline at end of file
+        return []
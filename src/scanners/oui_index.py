@@ -0,0 +1,189 @@
+"""
+Compiled, memory-mapped OUI index
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+
+# magic, source signature, entry count, node count, vendor count, vendor blob size
+INDEX_MAGIC = b"PPOUI\x00\x02\x00"
+INDEX_HEADER = struct.Struct("=8s16sIIII")
+
+# Registry prefixes are 24 (MA-L), 28 (MA-M) or 36 (MA-S) bits long
+MAX_PREFIX_NIBBLES = 9
+
+# Each trie node holds 16 child slots followed by one vendor slot
+NODE_SLOTS = 17
+VENDOR_SLOT = 16
+
+# A child slot with this bit set stores a leaf vendor id instead of a node index
+LEAF_FLAG = 0x80000000
+
+HEX_DIGITS = {digit: int(digit, 16) for digit in "0123456789ABCDEFabcdef"}
+
+
+def get_index_path(source):
+    """Get the compiled index path for an OUI source file"""
+    return os.path.splitext(source)[0] + ".idx"
+
+
+def get_sources_signature(sources):
+    """Fingerprint registry files by path, mtime and size"""
+    digest = hashlib.blake2b(digest_size=16)
+    for source in sources:
+        stat = os.stat(source)
+        digest.update(f"{os.path.abspath(source)}:{stat.st_mtime_ns}:{stat.st_size}\n".encode())
+    return digest.digest()
+
+
+def parse_oui_file(filename):
+    """Parse an IEEE MA-L, MA-M or MA-S registry into a hex prefix -> vendor dict"""
+    oui_dict = {}
+    with open(filename, 'r', encoding='utf-8', errors='replace') as f:
+        base_oui = None
+        for line in f:
+            parts = line.strip().split()
+            if '(hex)' in line and parts:
+                base_oui = parts[0].replace('-', '').upper()
+            elif '(base 16)' in line and len(parts) >= 4:
+                manufacturer = ' '.join(parts[3:])
+                if '-' in parts[0] and base_oui:
+                    # MA-M/MA-S blocks give a range such as E00000-EFFFFF below the
+                    # 24-bit OUI; the shared leading digits extend the prefix
+                    start, end = parts[0].upper().split('-', 1)
+                    oui = base_oui + os.path.commonprefix([start, end])
+                else:
+                    oui = parts[0].upper()
+                oui_dict[oui] = manufacturer
+    return oui_dict
+
+
+def build_oui_index(sources, index_path):
+    """Compile OUI registries into a flat longest-prefix-match nibble trie"""
+    oui_dict = {}
+    for source in sources:
+        oui_dict.update(parse_oui_file(source))
+
+    vendors = {}
+    trie = {}
+    entry_count = 0
+    for oui, vendor in oui_dict.items():
+        if not oui or len(oui) > MAX_PREFIX_NIBBLES or any(c not in HEX_DIGITS for c in oui):
+            continue
+        node = trie
+        for nibble in oui:
+            node = node.setdefault(HEX_DIGITS[nibble], {})
+        node[VENDOR_SLOT] = vendors.setdefault(vendor, len(vendors))
+        entry_count += 1
+
+    # Flatten breadth-first; nodes without children are stored inline as leaves
+    empty_node = array('I', [0]) * NODE_SLOTS
+    nodes = array('I', empty_node)
+    queue = [(trie, 0)]
+    for node, index in queue:
+        base = index * NODE_SLOTS
+        if VENDOR_SLOT in node:
+            nodes[base + VENDOR_SLOT] = node[VENDOR_SLOT] + 1
+        for nibble, child in node.items():
+            if nibble == VENDOR_SLOT:
+                continue
+            if len(child) == 1 and VENDOR_SLOT in child:
+                nodes[base + nibble] = LEAF_FLAG | child[VENDOR_SLOT]
+            else:
+                child_index = len(nodes) // NODE_SLOTS
+                nodes.extend(empty_node)
+                nodes[base + nibble] = child_index
+                queue.append((child, child_index))
+
+    offsets = array('I', [0])
+    blob = bytearray()
+    for vendor in vendors:
+        blob += vendor.encode('utf-8')
+        offsets.append(len(blob))
+
+    header = INDEX_HEADER.pack(
+        INDEX_MAGIC, get_sources_signature(sources), entry_count,
+        len(nodes) // NODE_SLOTS, len(vendors), len(blob)
+    )
+
+    # Write to a temporary file first so concurrent scanners never map a partial index
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        nodes.tofile(f)
+        offsets.tofile(f)
+        f.write(blob)
+    os.replace(tmp_path, index_path)
+
+    return index_path
+
+
+class OUIIndex:
+    """Read-only OUI lookup backed by a memory-mapped compiled trie"""
+
+    def __init__(self, index_path):
+        with open(index_path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.signature, self._entry_count, node_count, vendor_count, _ = INDEX_HEADER.unpack_from(self._map)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"Not a compiled OUI index: {index_path}")
+
+        view = memoryview(self._map)
+        offset = INDEX_HEADER.size
+        self._nodes = view[offset:offset + 4 * NODE_SLOTS * node_count].cast('I')
+        offset += 4 * NODE_SLOTS * node_count
+        self._offsets = view[offset:offset + 4 * (vendor_count + 1)].cast('I')
+        self._blob_start = offset + 4 * (vendor_count + 1)
+
+    def vendor(self, vendor_id):
+        """Decode a vendor name from the string table"""
+        start = self._blob_start + self._offsets[vendor_id]
+        end = self._blob_start + self._offsets[vendor_id + 1]
+        return self._map[start:end].decode('utf-8')
+
+    def get(self, oui, default=None):
+        """Get vendor for the longest registered prefix of a hex MAC/OUI string"""
+        if not oui:
+            return default
+
+        nodes = self._nodes
+        node = 0
+        best = 0
+        for nibble in oui[:MAX_PREFIX_NIBBLES]:
+            digit = HEX_DIGITS.get(nibble)
+            if digit is None:
+                break
+            slot = nodes[node * NODE_SLOTS + digit]
+            if slot & LEAF_FLAG:
+                best = (slot & ~LEAF_FLAG) + 1
+                break
+            if not slot:
+                break
+            node = slot
+            best = nodes[node * NODE_SLOTS + VENDOR_SLOT] or best
+
+        return self.vendor(best - 1) if best else default
+
+    def __len__(self):
+        return self._entry_count
+
+
+def load_oui_index(sources):
+    """Open the compiled index for registry files, rebuilding it when stale"""
+    index_path = get_index_path(sources[0])
+    signature = get_sources_signature(sources)
+
+    if os.path.exists(index_path):
+        try:
+            index = OUIIndex(index_path)
+            if index.signature == signature:
+                return index
+        except (ValueError, struct.error):
+            pass
+
+    build_oui_index(sources, index_path)
+    return OUIIndex(index_path)
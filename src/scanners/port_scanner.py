@@ -3,46 +3,75 @@ Port scanning functionality
 """
 
 import subprocess
+import xml.etree.ElementTree as ET
 from rich.console import Console
 
-from ..config.settings import MAIN_COLOR, SCAN_PORTS
+from ..config.settings import MAIN_COLOR, SCAN_PORTS, PORT_SCAN_CHUNK_SIZE
+from .http_scanner import fetch_headers
+from ..utils.metrics import metrics
 
 console = Console()
 
 
-def check_ports(ip, ports=None):
-    """Scan specific ports on a host"""
-    open_ports = []
-    
+def parse_nmap_xml(xml_output):
+    """Parse nmap XML output into a map of host IP to open ports"""
+    port_map = {}
+    root = ET.fromstring(xml_output)
+
+    for host in root.iter('host'):
+        address = host.find("address[@addrtype='ipv4']")
+        if address is None:
+            continue
+
+        open_ports = []
+        for port in host.iter('port'):
+            state = port.find('state')
+            # "open|filtered" and friends are not confirmed open ports
+            if state is not None and state.get('state') == 'open':
+                open_ports.append(port.get('portid'))
+
+        port_map[address.get('addr')] = open_ports
+
+    return port_map
+
+
+def check_ports_batch(ips, ports=None, timeout=None):
+    """Scan specific ports on many hosts with as few nmap runs as possible
+
+    timeout is accepted for engine compatibility; nmap adapts its own
+    probe timeouts to the measured round trip times.
+    """
+    port_map = {ip: [] for ip in ips}
+
     if ports is None:
         ports = SCAN_PORTS
-    
-    try:
-        ports_str = ",".join(map(str, ports))
-        result = subprocess.run([
-            "nmap", "-p", ports_str, ip
-        ], capture_output=True, text=True)
-        
-        for line in result.stdout.splitlines():
-            if "open" in line:
-                parts = line.split()
-                if parts:
-                    port = parts[0].split("/")[0]
-                    open_ports.append(port)
-        
-        return open_ports
-        
-    except Exception as e:
-        console.print(f":x: [bold red]Error scanning ports for {ip}:[/bold red] {e}", style=MAIN_COLOR)
-        return []
+
+    ports_str = ",".join(map(str, ports))
+
+    for start in range(0, len(ips), PORT_SCAN_CHUNK_SIZE):
+        chunk = ips[start:start + PORT_SCAN_CHUNK_SIZE]
+        try:
+            # Hosts are already known to be up: skip discovery and DNS
+            metrics.count('subprocesses')
+            result = subprocess.run([
+                "nmap", "-n", "-Pn", "-oX", "-", "-p", ports_str, *chunk
+            ], capture_output=True, text=True)
+
+            for ip, open_ports in parse_nmap_xml(result.stdout).items():
+                if ip in port_map:
+                    port_map[ip] = open_ports
+
+        except Exception as e:
+            console.print(f":x: [bold red]Error scanning ports for {len(chunk)} hosts:[/bold red] {e}", style=MAIN_COLOR)
+
+    return port_map
+
+
+def check_ports(ip, ports=None):
+    """Scan specific ports on a host"""
+    return check_ports_batch([ip], ports)[ip]
 
 
 def get_http_headers(ip):
     """Get HTTP headers from a host"""
-    import requests
-    
-    try:
-        response = requests.get(f"http://{ip}", timeout=2)
-        return response.headers
-    except Exception:
-        return {} 
\ No newline at end of file
+    return fetch_headers(ip)
@@ -2,11 +2,32 @@
 Utility modules
 """
 
-from .banner import print_banner
-from .telegram_sender import send_telegram_message, send_scan_results
-
-__all__ = [
-    'print_banner',
-    'send_telegram_message',
-    'send_scan_results'
-] 
\ No newline at end of file
+import importlib
+
+# Public name -> defining submodule, imported on first access.
+# The shared `metrics` collector is imported from .metrics directly.
+_EXPORTS = {
+    'print_banner': 'banner',
+    'send_telegram_message': 'telegram_sender',
+    'send_telegram_document': 'telegram_sender',
+    'send_devices_document': 'telegram_sender',
+    'send_scan_results': 'telegram_sender',
+    'queue_scan_results': 'telegram_sender',
+    'send_scan_changes': 'telegram_sender',
+    'queue_scan_changes': 'telegram_sender',
+    'flush_deliveries': 'telegram_sender',
+    'ScanMetrics': 'metrics',
+    'format_prometheus': 'metrics',
+    'write_prometheus_textfile': 'metrics',
+    'ScanProfiler': 'profiler',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
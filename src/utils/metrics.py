@@ -0,0 +1,179 @@
+"""
+Scan instrumentation: per-stage timing spans, counters and their export
+"""
+
+import os
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the per-host latency histogram buckets
+HISTOGRAM_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+METRIC_PREFIX = "port_phantom"
+
+
+class StageTiming:
+    """Accumulated time of one pipeline stage with a per-host histogram"""
+
+    __slots__ = ('calls', 'hosts', 'seconds', 'max_seconds', 'buckets')
+
+    def __init__(self):
+        self.calls = 0
+        self.hosts = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(HISTOGRAM_BUCKETS) + 1)
+
+    def observe(self, seconds, hosts=1):
+        """Record one call that handled `hosts` hosts in `seconds`"""
+        self.calls += 1
+        self.hosts += hosts
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if hosts:
+            # Batched calls count as `hosts` observations of their per-host share
+            self.buckets[bisect_left(HISTOGRAM_BUCKETS, seconds / hosts)] += hosts
+
+    def to_dict(self):
+        return {
+            'calls': self.calls,
+            'hosts': self.hosts,
+            'seconds': self.seconds,
+            'max_seconds': self.max_seconds,
+            'buckets': list(self.buckets),
+        }
+
+    def merge(self, data):
+        """Add another process's totals for this stage"""
+        self.calls += data['calls']
+        self.hosts += data['hosts']
+        self.seconds += data['seconds']
+        self.max_seconds = max(self.max_seconds, data['max_seconds'])
+        self.buckets = [a + b for a, b in zip(self.buckets, data['buckets'])]
+
+
+class ScanMetrics:
+    """Thread-safe stage timings and counters of the scan in progress"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start collecting for a new scan"""
+        with self._lock:
+            self.stages = {}
+            self.counters = {}
+
+    def observe(self, stage, seconds, hosts=1):
+        """Record a timing for a stage"""
+        with self._lock:
+            timing = self.stages.get(stage)
+            if timing is None:
+                timing = self.stages[stage] = StageTiming()
+            timing.observe(seconds, hosts)
+
+    @contextmanager
+    def span(self, stage, hosts=1):
+        """Time the enclosed block as one call of a stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, hosts)
+
+    def count(self, name, value=1):
+        """Increase a counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self):
+        """Snapshot as plain data for JSON and for passing between processes"""
+        with self._lock:
+            return {
+                'stages': {stage: timing.to_dict() for stage, timing in self.stages.items()},
+                'counters': dict(self.counters),
+            }
+
+    def merge(self, data):
+        """Add a snapshot taken in another process"""
+        with self._lock:
+            for stage, timing in data['stages'].items():
+                self.stages.setdefault(stage, StageTiming()).merge(timing)
+            for name, value in data['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+
+# Metrics of the current scan, shared by every module
+metrics = ScanMetrics()
+
+# Latest snapshot per subnet, so one textfile covers every subnet a daemon scans
+_textfile_scans = {}
+
+
+def _labels(**labels):
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"') for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+
+def format_prometheus(scans):
+    """Render {subnet: scan summary} in the Prometheus text exposition format"""
+    families = {}
+
+    def sample(name, kind, help_text, labels, value):
+        family = families.setdefault(name, (kind, help_text, []))
+        family[2].append(f"{name}{labels} {value}")
+
+    for subnet, scan in scans.items():
+        labels = _labels(subnet=subnet)
+        sample(f"{METRIC_PREFIX}_scan_duration_seconds", "gauge", "Duration of the last scan", labels, scan['duration'])
+        sample(f"{METRIC_PREFIX}_scan_devices", "gauge", "Devices found by the last scan", labels, scan['devices'])
+        sample(f"{METRIC_PREFIX}_scan_timestamp_seconds", "gauge", "Completion time of the last scan", labels, scan['timestamp'])
+
+        for name, value in scan['metrics']['counters'].items():
+            sample(f"{METRIC_PREFIX}_{name}", "gauge", f"{name.replace('_', ' ').capitalize()} in the last scan", labels, value)
+
+        for stage, timing in scan['metrics']['stages'].items():
+            stage_labels = _labels(subnet=subnet, stage=stage)
+            sample(f"{METRIC_PREFIX}_stage_seconds", "gauge", "Time spent per stage in the last scan", stage_labels, timing['seconds'])
+            sample(f"{METRIC_PREFIX}_stage_calls", "gauge", "Calls per stage in the last scan", stage_labels, timing['calls'])
+
+            name = f"{METRIC_PREFIX}_stage_host_seconds"
+            cumulative = 0
+            for bound, count in zip(HISTOGRAM_BUCKETS + ("+Inf",), timing['buckets']):
+                cumulative += count
+                sample(f"{name}_bucket", "histogram", "Per-host time per stage", _labels(subnet=subnet, stage=stage, le=bound), cumulative)
+            sample(f"{name}_sum", "histogram", None, stage_labels, timing['seconds'])
+            sample(f"{name}_count", "histogram", None, stage_labels, timing['hosts'])
+
+    lines = []
+    for name, (kind, help_text, samples) in families.items():
+        if help_text:
+            family = name[:-len("_bucket")] if name.endswith("_bucket") else name
+            lines.append(f"# HELP {family} {help_text}")
+            lines.append(f"# TYPE {family} {kind}")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus_textfile(filename, subnet, snapshot, duration, devices):
+    """Write scan metrics for the node_exporter textfile collector"""
+    _textfile_scans[subnet] = {
+        'metrics': snapshot,
+        'duration': duration,
+        'devices': devices,
+        'timestamp': int(time.time()),
+    }
+
+    directory = os.path.dirname(filename)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    # The collector may read at any moment, so never expose a partial file
+    tmp_filename = f"{filename}.{os.getpid()}.tmp"
+    with open(tmp_filename, 'w', encoding='utf-8') as f:
+        f.write(format_prometheus(_textfile_scans))
+    os.replace(tmp_filename, filename)
+    return filename
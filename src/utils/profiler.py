@@ -0,0 +1,135 @@
+"""
+CPU and memory profiling of a scan with cProfile and tracemalloc
+"""
+
+import io
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import tracemalloc
+from rich.console import Console
+from rich.table import Table
+from rich import box
+
+from ..config.settings import MAIN_COLOR, HISTORY_DIR, PROFILE_TOP_N, PROFILE_TRACE_FRAMES
+
+console = Console()
+
+# Python 3.12+ cProfile sees every thread; older versions need one profiler per thread
+PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+
+class ScanProfiler:
+    """Profile the enclosed block and write reports next to the scan history
+
+    Worker threads started inside the block are profiled too. Shard worker
+    processes are not.
+    """
+
+    def __init__(self, subnet, directory=None, top=None):
+        directory = directory or HISTORY_DIR
+        self.top = top or PROFILE_TOP_N
+        self.basename = f"{directory}/profile_{int(time.time())}_{subnet.replace('/', '-').replace(',', '_')}"
+        self.pstats_file = f"{self.basename}.pstats"
+        self.report_file = f"{self.basename}.txt"
+        self._profiler = cProfile.Profile()
+        self._thread_profilers = []
+        self._lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    def _profile_thread(self, frame, event, arg):
+        # First profiling event in a new thread: replace this hook with a profiler
+        profiler = cProfile.Profile()
+        with self._lock:
+            self._thread_profilers.append(profiler)
+        profiler.enable()
+
+    def __enter__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(PROFILE_TRACE_FRAMES)
+            self._started_tracemalloc = True
+        if PER_THREAD_PROFILERS:
+            threading.setprofile(self._profile_thread)
+        self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._profiler.disable()
+        if PER_THREAD_PROFILERS:
+            threading.setprofile(None)
+
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        try:
+            self.write_reports(snapshot, peak)
+        except Exception as e:
+            console.print(f":x: [bold red]Failed to write profile:[/bold red] {e}", style=MAIN_COLOR)
+        return False
+
+    def get_stats(self, stream=None):
+        """Combined statistics of the main and worker thread profilers"""
+        stats = pstats.Stats(self._profiler, stream=stream)
+        with self._lock:
+            for profiler in self._thread_profilers:
+                stats.add(profiler)
+        return stats
+
+    def write_reports(self, snapshot, peak):
+        """Write the .pstats dump and a text report, and print the top entries"""
+        os.makedirs(os.path.dirname(self.basename), exist_ok=True)
+
+        report = io.StringIO()
+        stats = self.get_stats(report)
+        stats.dump_stats(self.pstats_file)
+
+        report.write(f"Peak traced memory: {peak / 1024 / 1024:.1f} MB\n\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+
+        allocations = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        )).statistics('lineno')[:self.top]
+        report.write(f"Top {self.top} allocation sites\n")
+        for statistic in allocations:
+            report.write(f"{statistic}\n")
+
+        with open(self.report_file, 'w', encoding='utf-8') as f:
+            f.write(report.getvalue())
+
+        self.print_hotspots(stats)
+        self.print_allocations(allocations, peak)
+        console.print(f":bar_chart: [bold green]Profile saved to[/bold green] [underline]{self.pstats_file}[/underline] [bold green]and[/bold green] [underline]{self.report_file}[/underline]", style=MAIN_COLOR)
+
+    def print_hotspots(self, stats):
+        """Print the functions with the most time spent in their own code"""
+        table = Table(box=box.ROUNDED, title="🔥 CPU Hotspots", title_style="bold #1E90FF")
+        table.add_column("Function", style="bold #6495ED")
+        table.add_column("Calls", style="#48D1CC", justify="right")
+        table.add_column("Own Time", style="#48D1CC", justify="right")
+        table.add_column("Cumulative", style="#48D1CC", justify="right")
+
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:self.top]
+        for (filename, line, function), (_, calls, own_time, cumulative, _) in entries:
+            table.add_row(f"{function} ({os.path.basename(filename)}:{line})", str(calls), f"{own_time:.3f} s", f"{cumulative:.3f} s")
+
+        console.print(table)
+
+    def print_allocations(self, allocations, peak):
+        """Print the source lines holding the most memory at the end of the scan"""
+        table = Table(box=box.ROUNDED, title=f"🧠 Allocation Sites (peak {peak / 1024 / 1024:.1f} MB)", title_style="bold #1E90FF")
+        table.add_column("Location", style="bold #6495ED")
+        table.add_column("Size", style="#48D1CC", justify="right")
+        table.add_column("Blocks", style="#48D1CC", justify="right")
+
+        for statistic in allocations:
+            frame = statistic.traceback[0]
+            table.add_row(f"{frame.filename}:{frame.lineno}", f"{statistic.size / 1024:.1f} KB", str(statistic.count))
+
+        console.print(table)
@@ -2,56 +2,269 @@
 Telegram notification functionality
 """
 
-import requests
+import os
+import gzip
+import html
+import json
+import time
+import queue
+import threading
 from rich.console import Console
 
-from ..config.settings import TELEGRAM_BOT_TOKEN, AUTHORIZED_USER_ID, MAIN_COLOR
+from ..config.settings import (
+    TELEGRAM_BOT_TOKEN, AUTHORIZED_USER_ID, MAIN_COLOR, TELEGRAM_API_URL, TELEGRAM_TIMEOUT,
+    TELEGRAM_MESSAGE_LIMIT, TELEGRAM_MAX_MESSAGES, TELEGRAM_MAX_RETRIES, TELEGRAM_FLUSH_TIMEOUT
+)
 
 console = Console()
 
+RESULTS_HEADER = "🔍 <b>Network scan results</b>\n\n"
+CHANGES_HEADER = "🔔 <b>Network changes detected</b>\n\n"
+
+_session = None
+_session_lock = threading.Lock()
+
+_deliveries = queue.Queue()
+_delivery_thread = None
+_delivery_lock = threading.Lock()
+
+
+def get_telegram_session():
+    """Get the shared requests session kept open to the Bot API"""
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            import requests
+            _session = requests.Session()
+
+    return _session
+
+
+def call_telegram_api(method, data, files=None):
+    """Call a Bot API method, retrying on rate limits and transient errors"""
+    url = f"{TELEGRAM_API_URL}/bot{TELEGRAM_BOT_TOKEN}/{method}"
+    error = None
+
+    for attempt in range(TELEGRAM_MAX_RETRIES + 1):
+        delay = 2 ** attempt
+        try:
+            response = get_telegram_session().post(url, data=data, files=files, timeout=TELEGRAM_TIMEOUT)
+            if response.status_code == 200:
+                return True
+
+            error = response.status_code
+            if response.status_code == 429:
+                # Telegram says how long to back off for
+                try:
+                    delay = response.json()['parameters']['retry_after']
+                except (ValueError, KeyError, TypeError):
+                    pass
+            elif response.status_code < 500:
+                break
+        except Exception as e:
+            error = e
+
+        if attempt < TELEGRAM_MAX_RETRIES:
+            time.sleep(delay)
+
+    console.print(f":x: [bold red]Telegram send error:[/bold red] {error}", style=MAIN_COLOR)
+    return False
+
 
 def send_telegram_message(message, user_id=None):
     """Send message to Telegram"""
     if user_id is None:
         user_id = AUTHORIZED_USER_ID
-    
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+
     data = {
         "chat_id": user_id,
         "text": message,
         "parse_mode": "HTML"
     }
-    
+
+    if call_telegram_api("sendMessage", data):
+        console.print(":white_check_mark: [bold green]Notification sent to Telegram[/bold green]", style=MAIN_COLOR)
+        return True
+    return False
+
+
+def _send_document(name, content, user_id=None, caption=None):
+    """Send already compressed content to Telegram as a document"""
+    if user_id is None:
+        user_id = AUTHORIZED_USER_ID
+
+    data = {"chat_id": user_id}
+    if caption:
+        data["caption"] = caption
+        data["parse_mode"] = "HTML"
+    files = {"document": (name, content, "application/gzip")}
+
+    if call_telegram_api("sendDocument", data, files):
+        console.print(":white_check_mark: [bold green]Report sent to Telegram[/bold green]", style=MAIN_COLOR)
+        return True
+    return False
+
+
+def send_telegram_document(filename, user_id=None, caption=None):
+    """Send a file to Telegram as a gzip-compressed document"""
     try:
-        response = requests.post(url, data=data)
-        if response.status_code == 200:
-            console.print(":white_check_mark: [bold green]Notification sent to Telegram[/bold green]", style=MAIN_COLOR)
-            return True
-        else:
-            console.print(f":x: [bold red]Telegram send error:[/bold red] {response.status_code}", style=MAIN_COLOR)
-            return False
-    except Exception as e:
-        console.print(f":x: [bold red]Telegram send error:[/bold red] {e}", style=MAIN_COLOR)
+        with open(filename, 'rb') as f:
+            content = gzip.compress(f.read())
+    except OSError as e:
+        console.print(f":x: [bold red]Cannot read report for Telegram:[/bold red] {e}", style=MAIN_COLOR)
         return False
 
+    return _send_document(f"{os.path.basename(filename)}.gz", content, user_id, caption)
+
+
+def send_devices_document(devices, user_id=None, caption=None):
+    """Send devices to Telegram as a gzip-compressed JSON document built in memory"""
+    try:
+        content = gzip.compress(json.dumps(devices, ensure_ascii=False, indent=4, default=dict).encode('utf-8'))
+    except (TypeError, ValueError) as e:
+        console.print(f":x: [bold red]Cannot build report for Telegram:[/bold red] {e}", style=MAIN_COLOR)
+        return False
+
+    return _send_document(f"scan_{int(time.time())}.json.gz", content, user_id, caption)
+
+
+def format_device(device):
+    """Format one device as an HTML message block"""
+    ports = device.get('open ports', [])
+    return (
+        f"📱 <b>{html.escape(str(device.get('ip', 'Unknown')))}</b>\n"
+        f"🏭 Manufacturer: {html.escape(str(device.get('manufacturer', 'Unknown')))}\n"
+        f"⚠️ Risk: {html.escape(str(device.get('level', 'None')))} ({device.get('score', 0)})\n"
+        f"🔌 Ports: {', '.join(map(str, ports)) if ports else 'None'}\n\n"
+    )
+
+
+def format_changes(changes):
+    """Format a scan change set as HTML message blocks, one per change"""
+    escape = lambda value: html.escape(str(value))
+    ports = lambda values: ', '.join(map(str, values)) or 'None'
+    blocks = []
 
-def send_scan_results(devices, user_id=None):
-    """Send scan results to Telegram"""
+    for device in changes.get('new', []):
+        blocks.append(f"🆕 New device <b>{escape(device.get('ip'))}</b> ({escape(device.get('manufacturer', 'Unknown'))}), ports: {ports(device.get('open ports', []))}\n")
+    for device in changes.get('vanished', []):
+        blocks.append(f"👋 Vanished <b>{escape(device.get('ip'))}</b> ({escape(device.get('manufacturer', 'Unknown'))})\n")
+    for move in changes.get('moved', []):
+        blocks.append(f"➡️ {escape(move['mac'])} moved: {escape(move['from_ip'])} → <b>{escape(move['to_ip'])}</b>\n")
+    for change in changes.get('mac_changed', []):
+        blocks.append(f"⚠️ MAC changed on <b>{escape(change['ip'])}</b>: {escape(change['from_mac'])} → {escape(change['to_mac'])}\n")
+    for change in changes.get('ports_opened', []):
+        blocks.append(f"🔓 Ports opened on <b>{escape(change['ip'])}</b>: {ports(change['ports'])}\n")
+    for change in changes.get('ports_closed', []):
+        blocks.append(f"🔒 Ports closed on <b>{escape(change['ip'])}</b>: {ports(change['ports'])}\n")
+    for change in changes.get('risk_changed', []):
+        direction = "increased" if change['to_score'] > change['from_score'] else "decreased"
+        blocks.append(f"⚠️ Risk {direction} on <b>{escape(change['ip'])}</b>: {escape(change['from_level'])} → {escape(change['to_level'])} ({change['from_score']} → {change['to_score']})\n")
+
+    return blocks
+
+
+def chunk_messages(blocks, header="", limit=TELEGRAM_MESSAGE_LIMIT):
+    """Pack text blocks into as few messages under the limit as possible"""
+    messages = []
+    current = header
+
+    for block in blocks:
+        if len(current) + len(block) > limit and current != header:
+            messages.append(current)
+            current = header
+        current += block[:limit - len(current)]
+
+    if current != header:
+        messages.append(current)
+    return messages
+
+
+def truncate_messages(messages, total, limit=TELEGRAM_MAX_MESSAGES):
+    """Keep at most limit messages, the last one saying how much was left out"""
+    if len(messages) <= limit:
+        return messages
+
+    omitted = len(messages) - (limit - 1)
+    return messages[:limit - 1] + [f"⚠️ <b>Results truncated:</b> {omitted} more messages not sent ({total} in total)"]
+
+
+def send_scan_results(devices, user_id=None, report_file=None):
+    """Send scan results to Telegram, as a document when too long for a few messages
+
+    Without a report file the document is built in memory. If it cannot be
+    sent, at most TELEGRAM_MAX_MESSAGES messages go out, the last one saying
+    how much was left out.
+    """
     if not devices:
         return False
-    
-    message = "🔍 <b>Network scan results</b>\n\n"
-    
-    for device in devices:
-        ip = device.get('ip', 'Unknown')
-        manufacturer = device.get('manufacturer', 'Unknown')
-        score = device.get('score', 0)
-        level = device.get('level', 'None')
-        ports = device.get('open ports', [])
-        
-        message += f"📱 <b>{ip}</b>\n"
-        message += f"🏭 Manufacturer: {manufacturer}\n"
-        message += f"⚠️ Risk: {level} ({score})\n"
-        message += f"🔌 Ports: {', '.join(map(str, ports)) if ports else 'None'}\n\n"
-    
-    return send_telegram_message(message, user_id) 
\ No newline at end of file
+
+    messages = chunk_messages([format_device(device) for device in devices], RESULTS_HEADER)
+
+    if len(messages) > TELEGRAM_MAX_MESSAGES:
+        caption = f"🔍 <b>Network scan results</b>: {len(devices)} devices"
+        if report_file:
+            sent = send_telegram_document(report_file, user_id, caption)
+        else:
+            sent = send_devices_document(devices, user_id, caption)
+        if sent:
+            return True
+
+        messages = truncate_messages(messages, f"{len(devices)} devices")
+
+    return all([send_telegram_message(message, user_id) for message in messages])
+
+
+def send_scan_changes(changes, user_id=None):
+    """Send the changes since the previous scan as a short alert"""
+    blocks = format_changes(changes)
+    if not blocks:
+        return False
+
+    messages = truncate_messages(chunk_messages(blocks, CHANGES_HEADER), f"{len(blocks)} changes")
+    return all([send_telegram_message(message, user_id) for message in messages])
+
+
+def _delivery_worker():
+    """Send queued notifications one at a time"""
+    while True:
+        send, args = _deliveries.get()
+        try:
+            send(*args)
+        except Exception as e:
+            console.print(f":x: [bold red]Telegram send error:[/bold red] {e}", style=MAIN_COLOR)
+        finally:
+            _deliveries.task_done()
+
+
+def _queue_delivery(send, *args):
+    """Hand a send call to the background sender thread, starting it if needed"""
+    global _delivery_thread
+
+    with _delivery_lock:
+        if _delivery_thread is None:
+            _delivery_thread = threading.Thread(target=_delivery_worker, name="telegram-sender", daemon=True)
+            _delivery_thread.start()
+
+    _deliveries.put((send, args))
+
+
+def queue_scan_results(devices, user_id=None, report_file=None):
+    """Send scan results in the background so scanning is never blocked"""
+    _queue_delivery(send_scan_results, list(devices), user_id, report_file)
+
+
+def queue_scan_changes(changes, user_id=None):
+    """Send a change alert in the background"""
+    _queue_delivery(send_scan_changes, changes, user_id)
+
+
+def flush_deliveries(timeout=TELEGRAM_FLUSH_TIMEOUT):
+    """Wait up to timeout seconds for queued notifications, True if all were sent"""
+    with _deliveries.all_tasks_done:
+        done = _deliveries.all_tasks_done.wait_for(lambda: not _deliveries.unfinished_tasks, timeout)
+
+    if not done:
+        console.print(":warning: [bold yellow]Telegram notifications still pending, giving up[/bold yellow]", style=MAIN_COLOR)
+    return done